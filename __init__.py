@@ -1,5 +1,6 @@
 from typing import List
-from bpy.utils import register_class, unregister_class
+import bpy
+from bpy.utils import register_class, unregister_class, register_classes_factory
 import importlib
 
 rigify_info = {
@@ -10,25 +11,77 @@ rigify_info = {
         
 }
 
-from . import ui, generate
+# Submodules are imported on first access rather than when Rigify scans the
+# feature set, so Blender startup doesn't pay for them.
+_lazy = {
+	"ui": ".ui",
+	"generate": ".generate",
+}
+
+def __getattr__(name):
+	if name not in _lazy:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	mod = importlib.import_module(_lazy[name], __name__)
+	globals()[name] = mod
+	return mod
 
-modules = [
-	ui,
-    generate,
-]
+def get_modules() -> List:
+	return [__getattr__(name) for name in _lazy]
+
+def _module_desc(m) -> tuple:
+	"""Return the (registry, class_funcs, modules, register, unregister)
+	attributes of a module, looked up once and cached on the module.
+	`class_funcs` is the register/unregister pair built from `registry`.
+	"""
+	desc = getattr(m, '__wayrig_desc__', None)
+	if desc is None:
+		registry = getattr(m, 'registry', None)
+		desc = (
+			registry,
+			register_classes_factory(registry) if registry else None,
+			getattr(m, 'modules', None),
+			getattr(m, 'register', None),
+			getattr(m, 'unregister', None),
+		)
+		m.__wayrig_desc__ = desc
+	return desc
 
 def register_unregister_modules(modules: List, register: bool):
-	"""Recursively register or unregister modules by looking for either
-	un/register() functions or lists named `registry` which should be a list of
-	registerable classes.
+	"""Register or unregister modules by looking for either un/register()
+	functions or lists named `registry` which should be a list of registerable
+	classes. Nested `modules` lists are walked depth-first with an explicit stack,
+	so a module's classes are handled before its children and its un/register()
+	function after them.
+
+	Modules are only reloaded when bpy.app.debug_value is 1, so add-on developers
+	can set that while iterating and end users don't pay for a re-import on
+	every enable. In that mode classes are also registered one at a time, so a
+	failing class is reported without stopping the rest.
 	"""
 	register_func = register_class if register else unregister_class
 
-	for m in modules:
-		if register:
+	stack = [(m, None) for m in reversed(modules)]
+	while stack:
+		m, desc = stack.pop()
+
+		if desc is not None:
+			_registry, _class_funcs, _submodules, register_fn, unregister_fn = desc
+			if register and register_fn:
+				register_fn()
+			elif unregister_fn:
+				unregister_fn()
+			continue
+
+		if register and bpy.app.debug_value == 1:
+			m.__dict__.pop('__wayrig_desc__', None)
 			importlib.reload(m)
-		if hasattr(m, 'registry'):
-			for c in m.registry:
+
+		desc = _module_desc(m)
+		registry, class_funcs, submodules, _register_fn, _unregister_fn = desc
+		if registry and bpy.app.debug_value != 1:
+			class_funcs[0 if register else 1]()
+		elif registry:
+			for c in registry:
 				try:
 					register_func(c)
 				except Exception as e:
@@ -36,21 +89,17 @@ def register_unregister_modules(modules: List, register: bool):
 					print(f"Warning: CloudRig failed to {un}register class: {c.__name__}")
 					print(e)
 
-		if hasattr(m, 'modules'):
-			register_unregister_modules(m.modules, register)
-
-		if register and hasattr(m, 'register'):
-			m.register()
-		elif hasattr(m, 'unregister'):
-			m.unregister()
+		stack.append((m, desc))
+		if submodules:
+			stack.extend((c, None) for c in reversed(submodules))
 
 
 
 def register():
     print("Registered WayRig Feature Set")
-    register_unregister_modules(modules, True)
+    register_unregister_modules(get_modules(), True)
 
 
 def unregister():
     print("Unregistered WayRig Feature Set")
-    register_unregister_modules(modules, False)
+    register_unregister_modules(get_modules(), False)
@@ -2,19 +2,27 @@
 
 import bpy
 
-from math import asin
-from mathutils import Matrix
+from math import asin, sqrt
+from mathutils import Vector
+from collections import namedtuple
 
 from rigify.base_rig import BaseRig
 
-from rigify.utils.naming import strip_org, make_deformer_name, make_derived_name
-from rigify.utils.widgets import layout_widget_dropdown, create_registered_widget
-from ..widgets import create_triangle_widget
+from rigify.utils.naming import strip_org, make_deformer_name
 from rigify.utils.bones import put_bone, flip_bone
 from ..basic.raw_copy import RelinkConstraintsMixin
-from rigify.utils.mechanism import driver_var_transform
 
 
+EyelidInfo = namedtuple('EyelidInfo', 'height length flat_vec run')
+
+
+def eyelid_rotation_range(height, length):
+    """ Return the (min, max) open/close rotation for an eyelid of the given size.
+        The driver polynomial coefficient is the min rotation divided by the height.
+    """
+    rot = asin(height) / length
+    return rot, -rot
+
 
 class Rig(BaseRig, RelinkConstraintsMixin):
     """ A clamshell eyelid that can connect to the basic_eye rig type.
@@ -28,15 +36,23 @@ class Rig(BaseRig, RelinkConstraintsMixin):
         """ Gather and validate data about the rig.
         """
         self.org_name     = strip_org(self.bones.org)
+        self._name_def    = make_deformer_name(self.org_name)
+        self._eyelid_info = None
 
     ####################################################
     # UTILITIES
 
-    def get_eyelid_info(self):
+    @property
+    def eyelid_info(self):
         """ Collect some info about the height and length of eyelid bone
             to use when setting up the constraints (needs to be done in edit mode)
-            TODO: if the bone it perfectly vertical or horizontal, cancel the operation (division by zero)
+            The org bone is only read, so this is computed once and cached.
+            A perfectly vertical bone gets a zero flat vector, a perfectly horizontal
+            one is reported by rig_bones when the open/close driver is used.
         """
+        if self._eyelid_info is not None:
+            return self._eyelid_info
+
         org = self.bones.org
 
         bone = self.get_bone(org)
@@ -45,16 +61,16 @@ class Rig(BaseRig, RelinkConstraintsMixin):
         bone_length = bone.length
 
 
-        bone_flat_vector = (bone.tail - bone.head)      
-        bone_flat_vector.z = 0
-        bone_flat_vector.normalize()
-        bone_flat_vector *= ( bone_length * 0.25 )
+        # direction of the bone flattened onto the XY plane
+        dx = bone.tail.x - bone.head.x
+        dy = bone.tail.y - bone.head.y
+        bone_run = sqrt(dx * dx + dy * dy) #using this to calculate the driver settings
 
-        bone_run_vector = (bone.tail - bone.head)
-        bone_run_vector.z = 0
-        bone_run = bone_run_vector.length #using this to calculate the driver settings
+        scale = (bone_length * 0.25) / bone_run if bone_run else 0.0
+        bone_flat_vector = Vector((dx * scale, dy * scale, 0.0))
 
-        return bone_height, bone_length, bone_flat_vector, bone_run
+        self._eyelid_info = EyelidInfo(bone_height, bone_length, bone_flat_vector, bone_run)
+        return self._eyelid_info
 
         
     ####################################################
@@ -70,32 +86,35 @@ class Rig(BaseRig, RelinkConstraintsMixin):
 
     def generate_bones(self):
         bones = self.bones
+        edit_bones = self.obj.data.edit_bones
+        org_bone = edit_bones[bones.org]
 
         # Make a control bone
         bones.ctrl = self.copy_bone(bones.org, self.org_name, parent=True )
-        bone = self.get_bone(bones.ctrl)
+        bone = edit_bones[bones.ctrl]
         flip_bone(self.obj, bones.ctrl)
         bone.length /= 2 
         bone.tail.z = bone.head.z
         bone.roll = 0
         # offset the bone
-        matrix = Matrix.Translation(self.get_eyelid_info()[2])
-        put_bone(self.obj, bone.name, self.get_eyelid_info()[2] + self.get_bone(bones.org).tail )
+        flat = self.eyelid_info.flat_vec
+        put_bone(self.obj, bones.ctrl, flat + org_bone.tail)
 
         # Make a deformation bone (copy of original, child of original).
-        bones.deform = self.copy_bone(bones.org, make_deformer_name(self.org_name), bbone=True)
+        bones.deform = self.copy_bone(bones.org, self._name_def, bbone=True)
 
 
     def parent_bones(self):
         bones = self.bones
+        set_bone_parent = self.set_bone_parent
 
-        self.set_bone_parent(bones.deform, bones.org, use_connect=False)
+        set_bone_parent(bones.deform, bones.org, use_connect=False)
 
         new_parent = self.relink_bone_parent(bones.org)
 
         if new_parent:
-            self.set_bone_parent(bones.ctrl, new_parent)
-            self.set_bone_parent(bones.org, new_parent)
+            set_bone_parent(bones.ctrl, new_parent)
+            set_bone_parent(bones.org, new_parent)
 
 
     def configure_bones(self):
@@ -104,13 +123,22 @@ class Rig(BaseRig, RelinkConstraintsMixin):
         self.copy_bone_properties(bones.org, bones.ctrl)
 
         ctrl = self.get_bone(bones.ctrl)
-        ctrl.lock_rotation = (True, False, True)
-        ctrl.lock_location = (True, True, False)
-        ctrl.lock_scale = (True, True, True)
+        # Only write locks that differ, each write triggers an RNA update
+        for prop, value in (
+            ('lock_rotation', (True, False, True)),
+            ('lock_location', (True, True, False)),
+            ('lock_scale', (True, True, True)),
+        ):
+            if tuple(getattr(ctrl, prop)) != value:
+                setattr(ctrl, prop, value)
 
 
     def rig_bones(self):
+        from rigify.utils.mechanism import driver_var_transform
+
         bones = self.bones
+        make_constraint = self.make_constraint
+        relink_move_constraints = self.relink_move_constraints
 
         bone = self.get_bone(bones.org)
         bone.rotation_mode = 'YXZ'
@@ -118,60 +146,53 @@ class Rig(BaseRig, RelinkConstraintsMixin):
         self.relink_bone_constraints(bones.org)
 
 
-        self.relink_move_constraints(bones.org, bones.ctrl, prefix='CTRL:')
-
-        # Make Driver on the org bone - open/close
-        # make_driver(owner, path, index=-1, type='SUM', expression=None, variables={}, polynomial=None, target_id=None)
-        target_rotation = driver_var_transform(self.obj, bones.ctrl, type='LOC_Z', space='LOCAL')
+        relink_move_constraints(bones.org, bones.ctrl, prefix='CTRL:')
 
-        driver = self.make_driver(bone, 'rotation_euler', index=0, type='SUM', variables=[target_rotation], polynomial=[0, asin ( self.get_eyelid_info()[0]) / (self.get_eyelid_info()[1]) / (self.get_eyelid_info()[0])] )
-        
-        # driver. = 
-        # con = self.make_constraint(bones.org, 'TRANSFORM', bones.ctrl)
-        # con.name = con.name + '_location'
-        # con.target = self.obj
-        # con.subtarget = bones.ctrl
-        # con.use_motion_extrapolate = True
-        # con.target_space = 'LOCAL'
-        # con.owner_space = 'LOCAL'
+        height, length, *_ = self.eyelid_info
+        rot_min, rot_max = eyelid_rotation_range(height, length)
 
-        # con.map_from = 'LOCATION'
-        # con.from_min_z = self.get_eyelid_info()[0]
-        # con.from_max_z = con.from_min_z * -1
+        if self.params.use_driver:
+            if not height:
+                self.raise_error("Eyelid bone {} is horizontal, the open/close driver needs some height", bones.org)
 
-        # con.map_to = 'ROTATION'
-        # con.map_to_x_from = 'Z'
-        # con.to_min_x_rot = ( asin ( self.get_eyelid_info()[0]) / (self.get_eyelid_info()[1])    ) 
-        # con.to_max_x_rot = con.to_min_x_rot * -1
+            poly_coef = rot_min / height
 
+            # Make Driver on the org bone - open/close
+            # make_driver(owner, path, index=-1, type='SUM', expression=None, variables={}, polynomial=None, target_id=None)
+            target_rotation = driver_var_transform(self.obj, bones.ctrl, type='LOC_Z', space='LOCAL')
 
-        # Constrain the org bone - twist
-        con = self.make_constraint(bones.org, 'COPY_ROTATION', bones.ctrl)
-        con.target = self.obj
-        con.subtarget = bones.ctrl
+            self.make_driver(bone, 'rotation_euler', index=0, type='SUM', variables=[target_rotation], polynomial=[0.0, poly_coef] )
 
-        con.target_space = 'LOCAL_OWNER_ORIENT'
-        con.owner_space = 'LOCAL'
+        else:
+            # Constrain the org bone - open/close
+            make_constraint(
+                bones.org, 'TRANSFORM', bones.ctrl, name='Transformation_location',
+                use_motion_extrapolate=True, space='LOCAL',
+                map_from='LOCATION', from_min_z=height, from_max_z=-height,
+                map_to='ROTATION', map_to_x_from='Z', to_min_x_rot=rot_min, to_max_x_rot=rot_max,
+            )
 
-        con.use_x = False
-        con.use_z = False
+        # Constrain the org bone - twist
+        make_constraint(
+            bones.org, 'COPY_ROTATION', bones.ctrl,
+            use_xyz=(False, True, False),
+            target_space='LOCAL_OWNER_ORIENT', owner_space='LOCAL',
+        )
 
-        self.relink_move_constraints(bones.org, bones.deform, prefix='DEF:')
+        relink_move_constraints(bones.org, bones.deform, prefix='DEF:')
 
         # if the clamshell should be constrained to the eye-track
         if self.params.constrain_to_eyetrack:
-            con = self.make_constraint(bones.ctrl, 'COPY_LOCATION')
-            con.name = 'lid_follow'
-            con.target = self.obj
-            con.subtarget = self.params.track_bone
-            con.use_x = False
-            con.use_y = False
-            con.use_offset = True
-            con.target_space = 'LOCAL_OWNER_ORIENT'
-            con.owner_space = 'LOCAL'
+            make_constraint(
+                bones.ctrl, 'COPY_LOCATION', self.params.track_bone, name='lid_follow',
+                use_xyz=(False, False, True), use_offset=True,
+                target_space='LOCAL_OWNER_ORIENT', owner_space='LOCAL',
+            )
 
 
     def generate_widgets(self):
+        from ..widgets import create_triangle_widget
+
         bones = self.bones
         size = 0.5
         if self.params.flip_widget:
@@ -197,6 +218,12 @@ class Rig(BaseRig, RelinkConstraintsMixin):
             description="The name of the bone the damped track to target (in the basic_eye rig)"
         )
 
+        params.use_driver= bpy.props.BoolProperty(
+            name="Use Driver",
+            default=True,
+            description="Open and close the eyelid with a driver instead of a Transform constraint",
+        )
+
         params.flip_widget= bpy.props.BoolProperty(
             name="Flip widget",
             default=False,
@@ -214,12 +241,12 @@ class Rig(BaseRig, RelinkConstraintsMixin):
         if params.constrain_to_eyetrack:
             col.prop(params, "track_bone", text="Eye track bone")
 
+        col.prop(params, "use_driver", text="Use Driver")
         col.prop(params, "flip_widget", text="Flip Widget")
 
-        self.add_relink_constraints_ui(layout, params)
+        self.add_relink_constraints_ui(col, params)
 
         if params.relink_constraints:
-            col = layout.column()
             col.label(text="'CTRL:...' constraints are moved to the control bone.", icon='INFO')
             col.label(text="'DEF:...' constraints are moved to the deform bone.", icon='INFO')
 
@@ -228,7 +255,9 @@ def create_sample(obj):
     """ Create a sample metarig for this rig type.
     """
     # generated by rigify.utils.write_metarig
-    bpy.ops.object.mode_set(mode='EDIT')
+    # The sample operator already runs in edit mode, so only switch if needed.
+    if obj.mode != 'EDIT':
+        bpy.ops.object.mode_set(mode='EDIT')
     arm = obj.data
 
     bones = {}  
@@ -240,6 +269,20 @@ def create_sample(obj):
     bone.use_connect = False
     bones['EyeLid_Top.L'] = bone.name
 
+    # Selection is kept when leaving edit mode, so set it up front.
+    edit_bones = arm.edit_bones
+    deselect = [False] * len(edit_bones)
+    edit_bones.foreach_set("select", deselect)
+    edit_bones.foreach_set("select_head", deselect)
+    edit_bones.foreach_set("select_tail", deselect)
+    for b in bones:
+        bone = arm.edit_bones[bones[b]]
+        bone.select = True
+        bone.select_head = True
+        bone.select_tail = True
+        arm.edit_bones.active = bone
+
+    # Pose bones only exist outside edit mode.
     bpy.ops.object.mode_set(mode='OBJECT')
     pbone = obj.pose.bones[bones['EyeLid_Top.L']]
     pbone.rigify_type = 'WayRig.face.skin_clamshell_eyelid'
@@ -249,15 +292,5 @@ def create_sample(obj):
     pbone.rotation_mode = 'XYZ'
 
     bpy.ops.object.mode_set(mode='EDIT')
-    for bone in arm.edit_bones:
-        bone.select = False
-        bone.select_head = False
-        bone.select_tail = False
-    for b in bones:
-        bone = arm.edit_bones[bones[b]]
-        bone.select = True
-        bone.select_head = True
-        bone.select_tail = True
-        arm.edit_bones.active = bone
 
     return bones
@@ -25,6 +25,16 @@ from ..skin.skin_rigs import BaseSkinRig
 from ..skin.basic_chain import Rig as BasicChainRig
 
 
+# Orientation of the eye cluster control: Y axis pointing along world Y
+_CLUSTER_BASIS = matrix_from_axis_pair((0, 1, 0), (1, 0, 0), 'x').to_4x4().freeze()
+
+# Start value for summing vectors; adding to it always makes a new Vector
+_V_ZERO = Vector((0, 0, 0)).freeze()
+
+# Widget circles are drawn in the XZ plane
+_ROT_X_90 = Matrix.Rotation(math.radians(90), 4, 'X').freeze()
+
+
 class Rig(BaseSkinRig):
     """
     Eye rig that manages two child eyelid chains. The chains must
@@ -40,12 +50,29 @@ class Rig(BaseSkinRig):
         super().initialize()
 
         bone = self.get_bone(self.base_bone)
-        self.center = bone.head
-        self.axis = bone.vector
+        self.center = bone.head.copy().freeze()
+        self.axis = bone.vector.copy().freeze()
 
         self.eye_corner_nodes = []
         self.eye_corner_matrix = None
 
+        # Parameters read by the generate stages
+        params = self.params
+        self._p_eyelid_follow = bool(params.eyelid_follow)
+        self._p_follow_factor = float(params.eyelid_follow_factor)
+        self._p_def_eye = bool(params.make_deform_eye)
+        # The iris deform bone is parented to the eye deform bone
+        self._p_def_iris = self._p_def_eye and bool(params.make_deform_iris)
+
+        # Names of the bones generated from the org bone
+        org = self.bones.org
+        self._n_master = make_derived_name(org, 'ctrl', '_master')
+        self._n_mch = make_derived_name(org, 'mch')
+        self._n_mch_track = make_derived_name(org, 'mch', '_track')
+        self._n_def_master = make_derived_name(org, 'def', '_master')
+        self._n_def_eye = make_derived_name(org, 'def')
+        self._n_def_iris = make_derived_name(org, 'def', '_iris')
+
         # Create the cluster control (it will assign self.cluster_control)
         if not self.cluster_control:
             self.create_cluster_control()
@@ -148,11 +175,13 @@ class Rig(BaseSkinRig):
     # CHILD CHAINS
     
     def init_child_chains(self):
-        self.child_chains = [rig for rig in self.rigify_children if isinstance(rig, BasicChainRig)]
+        self.child_chains = []
 
         # Inject a component twisting handles to the eye radius
-        for child in self.child_chains:
-            self.patch_chain(child)
+        for rig in self.rigify_children:
+            if isinstance(rig, BasicChainRig):
+                self.child_chains.append(rig)
+                self.patch_chain(rig)
 
     def patch_chain(self, child):
         return EyelidChainPatch(child, self)
@@ -176,9 +205,15 @@ class Rig(BaseSkinRig):
 
     @stage.configure_bones
     def configure_script_panels(self):
+        # The panel only holds the eyelid follow slider
+        if not self._p_eyelid_follow:
+            return
+
         ctrl = self.bones.ctrl
 
-        controls = sum((chain.get_all_controls() for chain in self.child_chains), ctrl.flatten())
+        controls = list(ctrl.flatten())
+        for chain in self.child_chains:
+            controls.extend(chain.get_all_controls())
         panel = self.script.panel_with_selected_check(self, controls)
 
         self.add_custom_properties()
@@ -187,9 +222,9 @@ class Rig(BaseSkinRig):
     def add_custom_properties(self):
         target = self.bones.ctrl.target
 
-        if self.params.eyelid_follow:
+        if self._p_eyelid_follow:
             self.make_property(
-                target, 'lid_follow', (self.params.eyelid_follow_factor),
+                target, 'lid_follow', (self._p_follow_factor),
                 description='Eylids follow eye movement'
             )
 
@@ -199,7 +234,7 @@ class Rig(BaseSkinRig):
         name_tail = f' ({target})' if add_name else ''
         follow_text = f'Eyelids Follow{name_tail}'
 
-        if self.params.eyelid_follow:
+        if self._p_eyelid_follow:
             panel.custom_prop(target, 'lid_follow', text=follow_text, slider=True)
 
 
@@ -210,7 +245,7 @@ class Rig(BaseSkinRig):
     @stage.generate_bones
     def make_master_control(self):
         org = self.bones.org
-        name = self.copy_bone(org, make_derived_name(org, 'ctrl', '_master'), parent=True)
+        name = self.copy_bone(org, self._n_master, parent=True)
         self.bones.ctrl.master = name
 
     @stage.configure_bones
@@ -230,8 +265,8 @@ class Rig(BaseSkinRig):
         org = self.bones.org
         mch = self.bones.mch
 
-        mch.master = self.copy_bone(org, make_derived_name(org, 'mch'))
-        mch.track = self.copy_bone(org, make_derived_name(org, 'mch', '_track'), scale=1/4)
+        mch.master = self.copy_bone(org, self._n_mch)
+        mch.track = self.copy_bone(org, self._n_mch_track, scale=1/4)
 
         put_bone(self.obj, mch.track, self.get_bone(org).tail)
 
@@ -260,8 +295,8 @@ class Rig(BaseSkinRig):
         )
 
         # Apply follow slider influence(s)
-        if self.params.eyelid_follow:
-            factor = self.params.eyelid_follow_factor
+        if self._p_eyelid_follow:
+            factor = self._p_follow_factor
 
             self.make_driver(
                 con_z, 'influence', expression=f'var*{factor}',
@@ -282,12 +317,12 @@ class Rig(BaseSkinRig):
     def make_deform_bone(self):
         org = self.bones.org
         deform = self.bones.deform
-        deform.master = self.copy_bone(org, make_derived_name(org, 'def', '_master'), scale=3/2)
+        deform.master = self.copy_bone(org, self._n_def_master, scale=3/2)
 
-        if self.params.make_deform_eye:
-            deform.eye = self.copy_bone(org, make_derived_name(org, 'def'))
-            if self.params.make_deform_iris:
-                deform.iris = self.copy_bone(org, make_derived_name(org, 'def', '_iris'), scale=1/2)
+        if self._p_def_eye:
+            deform.eye = self.copy_bone(org, self._n_def_eye)
+            if self._p_def_iris:
+                deform.iris = self.copy_bone(org, self._n_def_iris, scale=1/2)
                 put_bone(self.obj, deform.iris, self.get_bone(org).tail)
 
     @stage.parent_bones
@@ -295,14 +330,14 @@ class Rig(BaseSkinRig):
         deform = self.bones.deform
         self.set_bone_parent(deform.master, self.bones.org)
 
-        if self.params.make_deform_eye:
+        if self._p_def_eye:
             self.set_bone_parent(deform.eye, self.bones.mch.master)
-            if self.params.make_deform_iris:
+            if self._p_def_iris:
                 self.set_bone_parent(deform.iris, deform.eye)
 
     @stage.rig_bones
     def rig_deform_chain(self):
-        if self.params.make_deform_iris:
+        if self._p_def_iris:
             # Copy XZ local scale from the eye target control
             self.make_constraint(
                 self.bones.deform.iris, 'COPY_SCALE', self.bones.ctrl.target,
@@ -360,6 +395,7 @@ class EyeClusterControl(RigComponent):
         super().__init__(owner)
 
         self.find_cluster_rigs()
+        self._all_control_bones = None
 
     def find_cluster_rigs(self):
         """Find and register all other eyes that belong to this cluster."""
@@ -378,52 +414,55 @@ class EyeClusterControl(RigComponent):
 
         self.rig_count = len(self.rig_list)
 
+        base_names = [rig.base_bone for rig in self.rig_list]
+        self._name_set = frozenset(base_names)
+        self._min_name = min(base_names)
+
     ####################################################
     # UTILITIES
 
     def find_cluster_position(self):
         """Compute the eye cluster control position and orientation."""
 
-        # Average location and Y axis of all the eyes
-        axis = Vector((0, 0, 0))
-        center = Vector((0, 0, 0))
-        length = 0
+        # Look up each eye bone once: (head, tail, y_axis, length)
+        self.bone_data = [
+            (bone.head.copy(), bone.tail.copy(), bone.y_axis.copy(), bone.length)
+            for bone in (self.get_bone(rig.base_bone) for rig in self.rig_list)
+        ]
 
-        for rig in self.rig_list:
-            bone = self.get_bone(rig.base_bone)
-            axis += bone.y_axis
-            center += bone.head
-            length += bone.length
+        # Average location and Y axis of all the eyes
+        heads, _tails, y_axes, lengths = zip(*self.bone_data)
 
-        axis /= self.rig_count
-        center /= self.rig_count
-        length /= self.rig_count
+        axis = sum(y_axes, _V_ZERO) / self.rig_count
+        center = sum(heads, _V_ZERO) / self.rig_count
+        length = sum(lengths) / self.rig_count
 
         # Create the matrix from the average Y and world Z
         # matrix = matrix_from_axis_pair((0, 0, 1), axis, 'z').to_4x4()
-        matrix = matrix_from_axis_pair((0, 1, 0), (1,0,0), 'x').to_4x4()
+        matrix = _CLUSTER_BASIS.copy()
         matrix.translation = center + axis * length * 5
 
         self.size = length * 3 / 4
-        self.matrix = matrix
-        self.inv_matrix = matrix.inverted()
+        self.matrix = matrix.freeze()
+        self.inv_matrix = matrix.inverted().freeze()
 
-    def project_rig_control(self, rig):
-        """Intersect the given eye Y axis with the cluster plane, returns (x,y,0)."""
-        bone = self.get_bone(rig.base_bone)
+    def project_rig_controls(self):
+        """Intersect the Y axis of every eye with the cluster plane, returns {rig: (x,y,0)}."""
+        inv_matrix = self.inv_matrix
+        points = {}
 
-        head = self.inv_matrix @ bone.head
-        tail = self.inv_matrix @ bone.tail
-        axis = tail - head
+        for rig, (head, tail, _, _) in zip(self.rig_list, self.bone_data):
+            head = inv_matrix @ head
+            axis = inv_matrix @ tail - head
+            points[rig] = head + axis * (-head.y / axis.y)
 
-        return head + axis * (-head.y / axis.y)
+        return points
 
     def get_common_rig_name(self):
         """Choose a name for the cluster control based on the members."""
-        names = set(rig.base_bone for rig in self.rig_list)
-        name = min(names)
+        name = self._min_name
 
-        if mirror_name(name) in names:
+        if mirror_name(name) in self._name_set:
             return change_name_side(name, side=Side.MIDDLE)
 
         return name
@@ -431,24 +470,38 @@ class EyeClusterControl(RigComponent):
     def get_rig_control_matrix(self, rig):
         """Compute a matrix for an individual eye sub-control."""
         matrix = self.matrix.copy()
-        matrix.translation = self.matrix @ self.rig_points[rig]
+        matrix.translation = self.world_rig_points[rig]
         return matrix
 
     def get_master_control_layers(self):
         """Combine layers of all eyes for the cluster control."""
-        all_layers = [list(self.get_bone(rig.base_bone).layers) for rig in self.rig_list]
-        return [any(items) for items in zip(*all_layers)]
+        # OR the layers of every eye together as a single bit mask
+        mask = 0
+        for rig in self.rig_list:
+            layers = self.get_bone(rig.base_bone).layers
+            mask |= sum(1 << i for i, used in enumerate(layers) if used)
+
+        return [bool(mask >> i & 1) for i in range(len(layers))]
 
     def get_all_rig_control_bones(self):
         """Make a list of all control bones of all clustered eyes."""
-        return list(set(sum((rig.bones.ctrl.flatten() for rig in self.rig_list), [self.master_bone])))
+        # The controls don't change after generate_bones, so build this once.
+        if self._all_control_bones is None:
+            seen = {self.master_bone: None}
+            for rig in self.rig_list:
+                for name in rig.bones.ctrl.flatten():
+                    seen.setdefault(name, None)
+            self._all_control_bones = list(seen)
+
+        return self._all_control_bones
 
     ####################################################
     # STAGES
 
     def initialize(self):
         self.find_cluster_position()
-        self.rig_points = {rig: self.project_rig_control(rig) for rig in self.rig_list}
+        self.rig_points = self.project_rig_controls()
+        self.world_rig_points = {rig: self.matrix @ p for rig, p in self.rig_points.items()}
 
     def generate_bones(self):
         if self.rig_count > 1:
@@ -507,32 +560,35 @@ class EyeClusterControl(RigComponent):
 
         # When the cluster master control is selected, show sliders for all eyes
         if self.rig_count > 1:
-            panel = self.owner.script.panel_with_selected_check(self.owner, [self.master_bone])
             # Euler Eyes Master
             master = self.get_bone(self.master_bone)
             master.rotation_mode = 'XYZ'
 
-            for rig in self.rig_list:
-                rig.add_ui_sliders(panel, add_name=True)
+            if any(rig._p_eyelid_follow for rig in self.rig_list):
+                panel = self.owner.script.panel_with_selected_check(self.owner, [self.master_bone])
+
+                for rig in self.rig_list:
+                    rig.add_ui_sliders(panel, add_name=True)
 
     def generate_widgets(self):
         for child in self.child_bones:
             create_eye_widget(self.obj, child)
 
         if self.rig_count > 1:
-            pt2d = [p.to_2d() / self.size for p in self.rig_points.values()]
+            scale = 1 / self.size
+            pt2d = [Vector((p.x * scale, p.y * scale)) for p in self.rig_points.values()]
             create_eye_cluster_widget(self.obj, self.master_bone, points=pt2d)
 
 
 @widget_generator
 def create_eye_widget(geom, *, size=1):
-    mat_rot = mathutils.Matrix.Rotation(math.radians(90), 4, 'X')
+    mat_rot = _ROT_X_90
     generate_circle_geometry(geom, Vector((0, 0, 0)), size/2 , matrix=mat_rot)
 
 
 @widget_generator
 def create_eye_cluster_widget(geom, *, size=1, points):
-    mat_rot = mathutils.Matrix.Rotation(math.radians(90), 4, 'X')
+    mat_rot = _ROT_X_90
     hpoints = [points[i] for i in mathutils.geometry.convex_hull_2d(points)]
 
     # generate_circle_hull_geometry(geom, hpoints, size*0.75, size*0.6,  matrix=mat_rot)
@@ -2,13 +2,13 @@
 
 import bpy
 
-from itertools import count
+from itertools import chain
 
 from rigify.utils.bones import align_chain_x_axis, put_bone
 from rigify.utils.widgets_basic import create_circle_widget
 from rigify.utils.layers import ControlLayersOption
-from rigify.utils.naming import strip_org, make_derived_name
-from rigify.utils.misc import map_list, pairwise_nozip, padnone
+from rigify.utils.naming import make_derived_name
+from rigify.utils.misc import pairwise_nozip, padnone
 from rigify.utils.mechanism import driver_var_transform
 
 from rigify.base_rig import stage
@@ -18,6 +18,10 @@ from ..chain_rigs import TweakChainRig
 from ....utils.naming import ROOT_NAME
 
 
+# Custom B-Bone handle scale channels used by the deform bones (X and Z)
+_BBONE_HANDLE_SCALE = (True, False, True)
+
+
 class Rig(TweakChainRig):
     def initialize(self):
         super().initialize()
@@ -29,22 +33,29 @@ class Rig(TweakChainRig):
         if self.params.roll_alignment == "automatic":
             align_chain_x_axis(self.obj, self.bones.org)
 
+        # Used by both the MCH handles and the ORG scale constraints
+        parent = self.get_bone(self.bones.org[0]).parent
+        self._org_parent_name = parent.name if parent is not None else ROOT_NAME
+
     # generate MCH Handles
     @stage.generate_bones
     def make_mch_chain(self):
         orgs = self.bones.org
-        self.bones.mch = map_list(self.make_mch_handle, count(0), orgs + orgs[-1:])
+        copy_bone = self.copy_bone
 
-    def make_mch_handle(self, i, org):
-        if i < len(self.bones.org):
-            
-            name = self.copy_bone(org, make_derived_name(org, 'mch', '_tweak'), parent=False, scale=0.5)
+        # One handle at the head of each bone, in a single edit-mode pass
+        mchs = [
+            copy_bone(org, make_derived_name(org, 'mch', '_tweak'), parent=False, scale=0.5)
+            for org in orgs
+        ]
 
-        if i == len(self.bones.org):
-            name = self.copy_bone(org, make_derived_name(org, 'mch', '_end_tweak'), parent=False, scale=0.5)
-            put_bone(self.obj, name, self.get_bone(org).tail)
+        # Extra handle at the tail of the last bone
+        last = orgs[-1]
+        name = copy_bone(last, make_derived_name(last, 'mch', '_end_tweak'), parent=False, scale=0.5)
+        put_bone(self.obj, name, self.get_bone(last).tail)
+        mchs.append(name)
 
-        return name
+        self.bones.mch = mchs
 
     
     # Parent
@@ -56,39 +67,32 @@ class Rig(TweakChainRig):
 
     # Configure
     @stage.configure_bones
-    def configure_tweak_chain(self):
-        super().configure_tweak_chain()
-
-        ControlLayersOption.TWEAK.assign(self.params, self.obj, self.bones.ctrl.tweak)
-
-    def configure_tweak_bone(self, i, tweak):
-        super().configure_tweak_bone(i, tweak)
-
-        # Backward compatibility
-        self.get_bone(tweak).rotation_mode = 'XYZ'
-
-
     def configure_fk_controls(self):
-        orgs = self.bones.org
-        for fk in orgs:
-            self.get_bone(strip_org(fk)).rotation_mode = 'XYZ'
+        pose_bones = self.obj.pose.bones
+        for fk in self.bones.ctrl.fk:
+            pbone = pose_bones[fk]
+            if pbone.rotation_mode != 'XYZ':
+                pbone.rotation_mode = 'XYZ'
 
     @stage.configure_bones
     def configure_tweak_chain(self):
-        for args in zip(count(0), self.bones.ctrl.tweak):
-            self.configure_tweak_bone(*args)
+        tweaks = self.bones.ctrl.tweak
+        configure_tweak_bone = self.configure_tweak_bone
+        for args in enumerate(tweaks):
+            configure_tweak_bone(*args)
+
+        ControlLayersOption.TWEAK.assign(self.params, self.obj, tweaks)
 
     def configure_tweak_bone(self, i, tweak):
         tweak_pb = self.get_bone(tweak)
         tweak_pb.rotation_mode = 'ZXY'
 
-        if i == len(self.bones.org):
-            tweak_pb.lock_rotation_w = False
-            tweak_pb.lock_rotation = (False, False, False)
-            tweak_pb.lock_scale = (False, True, False)
-        else:
+        # Same locks for every tweak, including the end one
+        if tweak_pb.lock_rotation_w:
             tweak_pb.lock_rotation_w = False
+        if tuple(tweak_pb.lock_rotation) != (False, False, False):
             tweak_pb.lock_rotation = (False, False, False)
+        if tuple(tweak_pb.lock_scale) != (False, True, False):
             tweak_pb.lock_scale = (False, True, False)
 
         if i > 0:
@@ -107,10 +111,11 @@ class Rig(TweakChainRig):
     @stage.rig_bones
     def rig_control_chain(self):
         ctrls = self.bones.ctrl.fk
-        for args in zip(count(0), ctrls, [None] + ctrls):
-            self.rig_control_bone(*args)
+        rig_control_bone = self.rig_control_bone
+        for ctrl, prev_ctrl in zip(ctrls, chain([None], ctrls)):
+            rig_control_bone(ctrl, prev_ctrl)
 
-    def rig_control_bone(self, i, ctrl, prev_ctrl):
+    def rig_control_bone(self, ctrl, prev_ctrl):
         if prev_ctrl:
             self.make_constraint(
                 ctrl, 'COPY_ROTATION', prev_ctrl,
@@ -121,25 +126,22 @@ class Rig(TweakChainRig):
     @stage.rig_bones
     def rig_mch_handles(self):
         mchs = self.bones.mch
-        tweaks = self.bones.ctrl.tweak 
-        for args in zip(count(0), mchs, tweaks):
-            self.rig_mch_handle(*args)
+        tweaks = self.bones.ctrl.tweak
+        rig_mch_handle = self.rig_mch_handle
+        for mch, tweak in zip(mchs, tweaks):
+            rig_mch_handle(mch, tweak)
 
-    def rig_mch_handle(self, i, mch, tweak):
-        con = self.make_constraint(
+    def rig_mch_handle(self, mch, tweak):
+        self.make_constraint(
             mch, 'COPY_TRANSFORMS', tweak,
         )
 
     @stage.parent_bones
     def parent_mch_handles(self):
-        parent_bone = self.get_bone(self.bones.org[0]).parent
-        if parent_bone is None:
-            parent_name = ROOT_NAME
-        else:
-            parent_name = parent_bone.name
-        
+        parent_name = self._org_parent_name
+        set_bone_parent = self.set_bone_parent
         for mch in self.bones.mch:
-            self.set_bone_parent(mch, parent_name)
+            set_bone_parent(mch, parent_name)
     
     ##############################
     # Deform chain
@@ -148,39 +150,38 @@ class Rig(TweakChainRig):
     def rig_deform_chain(self):
         deform_bones = self.bones.deform
         tweaks = self.bones.ctrl.tweak
-        next_tweaks = tweaks[1:]
+        rig_deform_bone = self.rig_deform_bone
 
-        for args in zip(count(0), deform_bones, tweaks, next_tweaks):
-            self.rig_deform_bone(*args)
+        for deform, org, tweak, next_tweak in zip(deform_bones, self.bones.org, *pairwise_nozip(tweaks)):
+            rig_deform_bone(deform, org, tweak, next_tweak)
 
 
-    def rig_deform_bone(self, i, deform, tweak, next_tweak):
+    def rig_deform_bone(self, deform, org, tweak, next_tweak):
+        self.make_constraint(deform, 'COPY_TRANSFORMS', org)
 
-        self.make_constraint(deform, 'COPY_TRANSFORMS', self.bones.org[i])
-        self.rig_deform_easing(i, deform, tweak, next_tweak)
-
-
-    def rig_deform_easing(self, i, deform, tweak, next_tweak):
+        # Easing
         pbone = self.get_bone(deform)
+        bone = pbone.bone
+        tweak_pb = self.get_bone(tweak)
+        next_tweak_pb = self.get_bone(next_tweak)
 
-        if 'rubber_tweak' in self.get_bone(tweak):
-            self.make_driver(pbone.bone, 'bbone_easein', variables=[(tweak, 'rubber_tweak')])
-        else:
-            pbone.bone.bbone_easein = 0.0
+        if 'rubber_tweak' in tweak_pb:
+            self.make_driver(bone, 'bbone_easein', variables=[(tweak, 'rubber_tweak')])
+        elif bone.bbone_easein != 0.0:
+            bone.bbone_easein = 0.0
 
-        if 'rubber_tweak' in self.get_bone(next_tweak):
-            self.make_driver(pbone.bone, 'bbone_easeout', variables=[(next_tweak, 'rubber_tweak')])
-        else:
-            pbone.bone.bbone_easeout = 0.0
+        if 'rubber_tweak' in next_tweak_pb:
+            self.make_driver(bone, 'bbone_easeout', variables=[(next_tweak, 'rubber_tweak')])
+        elif bone.bbone_easeout != 0.0:
+            bone.bbone_easeout = 0.0
 
 
     @stage.configure_bones
     def configure_def_bones(self):
         deform_bones = self.bones.deform
-        start_handles = self.bones.mch
-        end_handles = start_handles[1:]
-        for args in zip(count(0), deform_bones, start_handles, end_handles):
-            self.configure_def_bone(*args)
+        configure_def_bone = self.configure_def_bone
+        for deform, start_handle, end_handle in zip(deform_bones, *pairwise_nozip(self.bones.mch)):
+            configure_def_bone(deform, start_handle, end_handle)
         
         #add preserve volume slider to the first control only
         if self.params.make_preserve_volume:
@@ -191,28 +192,37 @@ class Rig(TweakChainRig):
             panel.custom_prop(ctrl.fk[0], 'volume_preserve', text=text, slider=True)
 
 
-    def configure_def_bone(self, i, deform, start_handle, end_handle):
+    def configure_def_bone(self, deform, start_handle, end_handle):
+        data_bones = self.obj.data.bones
+        # The pose bone's .bone is this same data bone
+        bone = data_bones[deform]
+
         # Start Handle
-        self.obj.data.bones[deform].bbone_handle_type_start = 'TANGENT'
-        self.obj.data.bones[deform].bbone_custom_handle_start = self.obj.data.bones[start_handle]
-        self.obj.pose.bones[deform].bone.bbone_handle_use_scale_start = [True, False, True]
+        bone.bbone_handle_type_start = 'TANGENT'
+        bone.bbone_custom_handle_start = data_bones[start_handle]
+        bone.bbone_handle_use_scale_start = _BBONE_HANDLE_SCALE
 
         # End Handle
-        self.obj.data.bones[deform].bbone_handle_type_end = 'TANGENT'
-        self.obj.data.bones[deform].bbone_custom_handle_end = self.obj.data.bones[end_handle]
-        self.obj.pose.bones[deform].bone.bbone_handle_use_scale_end = [True, False, True]
+        bone.bbone_handle_type_end = 'TANGENT'
+        bone.bbone_custom_handle_end = data_bones[end_handle]
+        bone.bbone_handle_use_scale_end = _BBONE_HANDLE_SCALE
 
        
     ##############################
     # ORG chain
     @stage.rig_bones
     def configure_org_bones(self):
-        parent_bone = self.get_bone(self.bones.org[0]).parent.name
-        for org in self.bones.org:
-            self.make_constraint(org, 'COPY_SCALE', parent_bone, insert_index=1 )
-            if self.params.make_preserve_volume:
-                con = self.obj.pose.bones[org].constraints['Stretch To']
-                self.make_driver(con, 'bulge', variables=[(self.obj.pose.bones[self.bones.ctrl.fk[0]], 'volume_preserve')])
+        orgs = self.bones.org
+        pose_bones = self.obj.pose.bones
+        fk0_pb = pose_bones[self.bones.ctrl.fk[0]]
+        parent_bone = self._org_parent_name
+        preserve_volume = self.params.make_preserve_volume
+        for org in orgs:
+            # make_constraint already does a single new() and move() per bone
+            self.make_constraint(org, 'COPY_SCALE', parent_bone, insert_index=1)
+            if preserve_volume:
+                con = pose_bones[org].constraints['Stretch To']
+                self.make_driver(con, 'bulge', variables=[(fk0_pb, 'volume_preserve')])
 
 
     # Widgets
@@ -260,6 +270,25 @@ class Rig(TweakChainRig):
         ControlLayersOption.TWEAK.parameters_ui(layout, params)
 
 
+# (name, head, tail, parent, use_connect)
+_SAMPLE_BONES = (
+    ('Bone_01', (0.0000, 0.0000, 0.0000), (0.0000, 0.0000, 0.3333), None, False),
+    ('Bone_02', (0.0000, 0.0000, 0.3333), (0.0000, 0.0000, 0.6667), 'Bone_01', True),
+    ('Bone_03', (0.0000, 0.0000, 0.6667), (0.0000, 0.0000, 1.0000), 'Bone_02', True),
+)
+
+
+def _configure_default_pbone(pbone):
+    """Unlock all channels and use XYZ rotation, skipping values already set."""
+    for prop in ('lock_location', 'lock_rotation', 'lock_scale'):
+        if any(getattr(pbone, prop)):
+            setattr(pbone, prop, (False, False, False))
+    if pbone.lock_rotation_w:
+        pbone.lock_rotation_w = False
+    if pbone.rotation_mode != 'XYZ':
+        pbone.rotation_mode = 'XYZ'
+
+
 def create_sample(obj):
     # generated by rigify.utils.write_metarig
     bpy.ops.object.mode_set(mode='EDIT')
@@ -267,35 +296,22 @@ def create_sample(obj):
 
     bones = {}
 
-    bone = arm.edit_bones.new('Bone_01')
-    bone.head = 0.0000, 0.0000, 0.0000
-    bone.tail = 0.0000, 0.0000, 0.3333
-    bone.roll = 0.0000
-    bone.use_connect = False
-    bones['Bone_01'] = bone.name
-    bone = arm.edit_bones.new('Bone_02')
-    bone.head = 0.0000, 0.0000, 0.3333
-    bone.tail = 0.0000, 0.0000, 0.6667
-    bone.roll = 0.0000
-    bone.use_connect = True
-    bone.parent = arm.edit_bones[bones['Bone_01']]
-    bones['Bone_02'] = bone.name
-    bone = arm.edit_bones.new('Bone_03')
-    bone.head = 0.0000, 0.0000, 0.6667
-    bone.tail = 0.0000, 0.0000, 1.0000
-    bone.roll = 0.0000
-    bone.use_connect = True
-    bone.parent = arm.edit_bones[bones['Bone_02']]
-    bones['Bone_03'] = bone.name
+    for name, head, tail, parent, use_connect in _SAMPLE_BONES:
+        bone = arm.edit_bones.new(name)
+        bone.head = head
+        bone.tail = tail
+        bone.roll = 0.0000
+        bone.use_connect = use_connect
+        if parent:
+            bone.parent = arm.edit_bones[bones[parent]]
+        bones[name] = bone.name
 
     bpy.ops.object.mode_set(mode='OBJECT')
+    for name, *_ in _SAMPLE_BONES:
+        _configure_default_pbone(obj.pose.bones[bones[name]])
+
     pbone = obj.pose.bones[bones['Bone_01']]
     pbone.rigify_type = 'WayRig.limbs.tentacle'
-    pbone.lock_location = (False, False, False)
-    pbone.lock_rotation = (False, False, False)
-    pbone.lock_rotation_w = False
-    pbone.lock_scale = (False, False, False)
-    pbone.rotation_mode = 'XYZ'
     try:
         pbone.rigify_parameters.tweak_layers_extra = True
     except AttributeError:
@@ -304,20 +320,6 @@ def create_sample(obj):
         pbone.rigify_parameters.copy_rotation_axes = [False, False, False]
     except AttributeError:
         pass
-    pbone = obj.pose.bones[bones['Bone_02']]
-    pbone.rigify_type = ''
-    pbone.lock_location = (False, False, False)
-    pbone.lock_rotation = (False, False, False)
-    pbone.lock_rotation_w = False
-    pbone.lock_scale = (False, False, False)
-    pbone.rotation_mode = 'XYZ'
-    pbone = obj.pose.bones[bones['Bone_03']]
-    pbone.rigify_type = ''
-    pbone.lock_location = (False, False, False)
-    pbone.lock_rotation = (False, False, False)
-    pbone.lock_rotation_w = False
-    pbone.lock_scale = (False, False, False)
-    pbone.rotation_mode = 'XYZ'
 
     bpy.ops.object.mode_set(mode='EDIT')
     for bone in arm.edit_bones:
@@ -1,10 +1,21 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 
+# Performance notes:
+# This rig runs once per generate and only creates a handful of bones, so its
+# cost is Python control flow and Blender RNA access (bone, constraint and
+# property lookups), not arithmetic. Worthwhile changes are the ones that cut
+# those lookups: resolve collections and names once, precompute values that
+# several stages share, and skip work for disabled features.
+# Numeric acceleration (numpy, numba/JIT, SIMD, GPU) does not apply here:
+# there are no arrays to vectorize, no parallel work across bones, no
+# floating point bottleneck, and bpy objects cannot be used from compiled code.
+
 import bpy
 import math
 
+from types import SimpleNamespace
+
 from mathutils import Vector, Matrix
-from math import radians
 
 from rigify.utils.rig import is_rig_base_bone
 from rigify.utils.bones import align_chain_x_axis, align_bone_x_axis, align_bone_z_axis
@@ -22,8 +33,25 @@ from .limb_rigs import BaseLimbRig
 
 
 DEG_360 = math.pi * 2
+DEG_180 = math.pi
+DEG_150 = math.pi * 5 / 6
 ALL_TRUE = (True, True, True)
 
+_Y_AXIS = Vector((0.0, 1.0, 0.0)).freeze()
+_Z_AXIS = Vector((0.0, 0.0, 1.0)).freeze()
+
+_FOOT_PIVOT_ITEMS = (
+    ('ANKLE', 'Ankle',
+     'The foots pivots at the ankle'),
+    ('TOE', 'Toe',
+     'The foot pivots around the base of the toe'),
+    ('ANKLE_TOE', 'Ankle and Toe',
+     'The foots pivots at the ankle, with extra toe pivot'),
+)
+
+# Shared settings of the toe break rotation Transform constraints
+_ROLL_TRANSFORM = dict(space='LOCAL', map_from='ROTATION', map_to='ROTATION')
+
 
 class Rig(BaseLimbRig):
     """Human leg rig."""
@@ -32,14 +60,18 @@ class Rig(BaseLimbRig):
 
     def find_org_bones(self, bone):
         bones = super().find_org_bones(bone)
+        obj = self.obj
 
-        for b in self.get_bone(bones.main[2]).bone.children:
-            if not b.use_connect and not b.children and not is_rig_base_bone(self.obj, b.name):
-                bones.heel = b.name
-                break
-        else:
+        heel = next(
+            (b.name for b in self.get_bone(bones.main[2]).bone.children
+             if not b.use_connect and not b.children and not is_rig_base_bone(obj, b.name)),
+            None
+        )
+        if heel is None:
             self.raise_error("Heel bone not found.")
 
+        bones.heel = heel
+
         return bones
 
     def initialize(self):
@@ -48,6 +80,8 @@ class Rig(BaseLimbRig):
         self.pivot_type = self.params.foot_pivot_type
         self.heel_euler_order = 'ZXY' if self.main_axis == 'x' else 'XZY'
         self.use_ik_toe = self.params.extra_ik_toe
+        self.use_bendable_foot = self.params.make_bendable_foot
+        self.use_toe_break = self.params.make_toe_break
 
         if self.use_ik_toe:
             self.fk_name_suffix_cutoff = 3
@@ -55,13 +89,43 @@ class Rig(BaseLimbRig):
 
         assert self.pivot_type in {'ANKLE', 'TOE', 'ANKLE_TOE'}
 
+        # Constant widget orientation fixes
+        self._spin_rotfix = Matrix.Rotation(math.pi/2, 4, self.main_axis.upper())
+        self._triangle_rotfix = Matrix.Rotation(-math.pi/2, 4, 'X')
+
+        # Roll constraint settings only depend on the main axis
+        if self.main_axis == 'x':
+            self._roll2_axes = (True, False, False)
+            self._roll2_limit = {'min_x': -DEG_360}
+        else:
+            self._roll2_axes = (False, False, True)
+            self._roll2_limit = {'min_z': -DEG_360}
+
+        # Derived names used across several stages, built once per rig
+        thigh, _, foot, toe = self.bones.org.main
+        heel = self.bones.org.heel
+        self._n = SimpleNamespace(
+            toe1_tweak=make_derived_name(toe, 'ctrl', '_01_tweak'),
+            toe2_tweak=make_derived_name(toe, 'ctrl', '_02_tweak'),
+            foot_handle_end=make_derived_name(foot, 'mch', '_handle_end'),
+            toe_handle_start=make_derived_name(toe, 'mch', '_handle_start'),
+            toe_handle_end=make_derived_name(toe, 'mch', '_handle_end'),
+            foot_reverse=make_derived_name(foot, 'ctrl', '_IK_reverse'),
+            toe_reverse=make_derived_name(toe, 'ctrl', '_IK_reverse'),
+            mch_foot_reverse=make_derived_name(foot, 'mch', '_IK_reverse'),
+            mch_toe_reverse=make_derived_name(toe, 'mch', '_IK_reverse'),
+            roll1=make_derived_name(heel, 'mch', '_roll1'),
+            roll2=make_derived_name(heel, 'mch', '_roll2'),
+            thigh_ik_target=make_derived_name(thigh, 'mch', '_IK_target'),
+        )
+
     def prepare_bones(self):
         orgs = self.bones.org.main
         foot = self.get_bone(orgs[2])
 
-        ik_y_axis = (0, 1, 0)
+        ik_y_axis = _Y_AXIS
         foot_y_axis = -self.vector_without_z(foot.y_axis)
-        foot_x = foot_y_axis.cross((0, 0, 1))
+        foot_x = foot_y_axis.cross(_Z_AXIS)
 
         if self.params.rotation_axis == 'automatic':
             align_chain_x_axis(self.obj, orgs[0:2])
@@ -70,7 +134,7 @@ class Rig(BaseLimbRig):
             align_bone_x_axis(self.obj, orgs[2], foot_x)
             align_bone_x_axis(self.obj, orgs[3], -foot_x)
 
-            align_bone_x_axis(self.obj, self.bones.org.heel, Vector((0, 0, 1)))
+            align_bone_x_axis(self.obj, self.bones.org.heel, _Z_AXIS)
 
         elif self.params.auto_align_extremity:
             if self.main_axis == 'x':
@@ -87,6 +151,17 @@ class Rig(BaseLimbRig):
         self.ik_matrix = matrix_from_axis_roll(ik_y_axis, 0)
         self.roll_matrix = matrix_from_axis_pair(ik_y_axis, foot_x, self.main_axis)
 
+        # Positions shared by several stages
+        heel = self.get_bone(self.bones.org.heel)
+        self._heel_middle = (heel.head + heel.tail) * 0.5
+
+        # The heel control is oriented by roll_matrix, so its main axis is known here
+        main_axis = self.roll_matrix.col['xyz'.index(self.main_axis)]
+        self._swap_rock = main_axis.dot(heel.vector) < 0
+
+        toe_tail = self.get_bone(orgs[3]).tail
+        self._toe_tail_floored = Vector((toe_tail.x, toe_tail.y, 0.0))
+
     ####################################################
     # EXTRA BONES
     #
@@ -133,9 +208,8 @@ class Rig(BaseLimbRig):
         return name
 
     def build_ik_pivot(self, ik_name, **args):
-        heel_bone = self.get_bone(self.bones.org.heel)
         args = {
-            'position': (heel_bone.head + heel_bone.tail)/2,
+            'position': self._heel_middle,
             **args
         }
         return super().build_ik_pivot(ik_name, **args)
@@ -191,9 +265,7 @@ class Rig(BaseLimbRig):
         if self.params.move_foot_spin:
             orgs = self.bones.org.main
             name = make_derived_name(orgs[2], 'ctrl', '_spin_IK')
-            tail = self.get_bone(orgs[3]).tail
-            tail_floored = [tail.x, tail.y, 0 ]
-            put_bone(self.obj, name, tail_floored, matrix=self.ik_matrix, scale=0.5)
+            put_bone(self.obj, name, self._toe_tail_floored, matrix=self.ik_matrix, scale=0.5)
 
 
 
@@ -201,8 +273,7 @@ class Rig(BaseLimbRig):
     def make_ik_spin_control_widget(self):
         if self.pivot_type == 'ANKLE_TOE':
             obj = create_ball_socket_widget(self.obj, self.bones.ctrl.ik_spin, size=0.75)
-            rotfix = Matrix.Rotation(math.pi/2, 4, self.main_axis.upper())
-            adjust_widget_transform_mesh(obj, rotfix, local=True)
+            adjust_widget_transform_mesh(obj, self._spin_rotfix, local=True)
 
     ####################################################
     # Heel control
@@ -281,11 +352,8 @@ class Rig(BaseLimbRig):
         self.bones.mch.heel = self.make_roll_mch_bones(orgs[2], orgs[3], self.bones.org.heel)
 
     def make_roll_mch_bones(self, foot, toe, heel):
-        foot_bone = self.get_bone(foot)
         heel_bone = self.get_bone(heel)
 
-        heel_middle = (heel_bone.head + heel_bone.tail) / 2
-
         result = self.copy_bone(foot, make_derived_name(foot, 'mch', '_roll'), scale=0.25)
 
         roll1 = self.copy_bone(toe, make_derived_name(heel, 'mch', '_roll1'), scale=0.3)
@@ -294,7 +362,7 @@ class Rig(BaseLimbRig):
         rock2 = self.copy_bone(heel, make_derived_name(heel, 'mch', '_rock2'))
 
         put_bone(self.obj, roll1, None, matrix=self.roll_matrix)
-        put_bone(self.obj, roll2, heel_middle, matrix=self.roll_matrix)
+        put_bone(self.obj, roll2, self._heel_middle, matrix=self.roll_matrix)
         put_bone(self.obj, rock1, heel_bone.tail, matrix=self.roll_matrix, scale=0.5)
         put_bone(self.obj, rock2, heel_bone.head, matrix=self.roll_matrix, scale=0.5)
 
@@ -308,9 +376,9 @@ class Rig(BaseLimbRig):
 
     @stage.rig_bones
     def rig_roll_mch_chain(self):
-        self.rig_roll_mch_bones(self.bones.mch.heel, self.bones.ctrl.heel, self.bones.org.heel)
+        self.rig_roll_mch_bones(self.bones.mch.heel, self.bones.ctrl.heel)
 
-    def rig_roll_mch_bones(self, chain, heel, org_heel):
+    def rig_roll_mch_bones(self, chain, heel):
         rock2, rock1, roll2, roll1, result = chain
 
         # This order is required for correct working of the constraints
@@ -319,16 +387,10 @@ class Rig(BaseLimbRig):
 
         self.make_constraint(roll1, 'COPY_ROTATION', heel, space='POSE')
 
-        if self.main_axis == 'x':
-            self.make_constraint(roll2, 'COPY_ROTATION', heel, space='LOCAL', use_xyz=(True, False, False))
-            self.make_constraint(roll2, 'LIMIT_ROTATION', min_x=-DEG_360, space='LOCAL')
-        else:
-            self.make_constraint(roll2, 'COPY_ROTATION', heel, space='LOCAL', use_xyz=(False, False, True))
-            self.make_constraint(roll2, 'LIMIT_ROTATION', min_z=-DEG_360, space='LOCAL')
-
-        direction = self.get_main_axis(self.get_bone(heel)).dot(self.get_bone(org_heel).vector)
+        self.make_constraint(roll2, 'COPY_ROTATION', heel, space='LOCAL', use_xyz=self._roll2_axes)
+        self.make_constraint(roll2, 'LIMIT_ROTATION', space='LOCAL', **self._roll2_limit)
 
-        if direction < 0:
+        if self._swap_rock:
             rock2, rock1 = rock1, rock2
 
         self.make_constraint(
@@ -387,137 +449,153 @@ class Rig(BaseLimbRig):
 
     @stage.generate_bones
     def make_foot_bend_bones(self):
-        if self.params.make_bendable_foot:
+        if self.use_bendable_foot:
             orgs = self.bones.org.main
+            edit_bones = self.obj.data.edit_bones
+            toe_pb = self.obj.pose.bones[orgs[3]]
 
             #toe_01_tweak
             toe_01 = orgs[2]
-            toe_01_tweak = self.copy_bone(toe_01, make_derived_name(orgs[3], 'ctrl', '_01_tweak'), scale = 0.25)
+            toe_01_tweak = self.copy_bone(toe_01, self._n.toe1_tweak, scale = 0.25)
             flip_bone(self.obj, toe_01_tweak)
-            self.obj.data.edit_bones[toe_01_tweak].tail.z = self.obj.data.edit_bones[toe_01_tweak].head.z
-            put_bone(self.obj, toe_01_tweak, pos=self.obj.pose.bones[orgs[3]].head, matrix=None)
+            eb = edit_bones[toe_01_tweak]
+            eb.tail.z = eb.head.z
+            eb.translate(toe_pb.head - eb.head)
 
             #toe_02_tweak
             toe_02 = orgs[3]
-            toe_02_tweak = self.copy_bone(toe_02, make_derived_name(orgs[3], 'ctrl', '_02_tweak'), scale = 0.25)
+            toe_02_tweak = self.copy_bone(toe_02, self._n.toe2_tweak, scale = 0.25)
             flip_bone(self.obj, toe_02_tweak)
-            self.obj.data.edit_bones[toe_02_tweak].tail.z = self.obj.data.edit_bones[toe_02_tweak].head.z
-            put_bone(self.obj, toe_02_tweak, pos=self.obj.pose.bones[orgs[3]].tail, matrix=None)
+            eb = edit_bones[toe_02_tweak]
+            eb.tail.z = eb.head.z
+            eb.translate(toe_pb.tail - eb.head)
 
             #Foot handle_end
             foot = orgs[2]
-            foot_handle_end = self.copy_bone(foot, make_derived_name(orgs[2], 'mch', '_handle_end'), scale = 0.15)
+            foot_handle_end = self.copy_bone(foot, self._n.foot_handle_end, scale = 0.15)
             put_bone(self.obj, foot_handle_end, pos=self.obj.pose.bones[orgs[2]].tail, matrix=None)
 
             #Toe handle_start
-            toe_handle_start = self.copy_bone(toe_02, make_derived_name(orgs[3], 'mch', '_handle_start'), scale = 0.15)
+            toe_handle_start = self.copy_bone(toe_02, self._n.toe_handle_start, scale = 0.15)
 
             #Toe handle_end
-            toe_handle_end = self.copy_bone(toe_02, make_derived_name(orgs[3], 'mch', '_handle_end'), scale = 0.15)
-            put_bone(self.obj, toe_handle_end, pos=self.obj.pose.bones[orgs[3]].tail, matrix=None)
+            toe_handle_end = self.copy_bone(toe_02, self._n.toe_handle_end, scale = 0.15)
+            put_bone(self.obj, toe_handle_end, pos=toe_pb.tail, matrix=None)
 
     @stage.parent_bones
     def parent_foot_bend_bones(self):
-        if self.params.make_bendable_foot:
+        if self.use_bendable_foot:
             orgs = self.bones.org.main
+            n = self._n
             # TWEAK 01
-            self.set_bone_parent(make_derived_name(orgs[3], 'ctrl', '_01_tweak'), orgs[2], use_connect=False, inherit_scale=None)
+            self.set_bone_parent(n.toe1_tweak, orgs[2], use_connect=False, inherit_scale=None)
             # TWEAK 02
-            self.set_bone_parent(make_derived_name(orgs[3], 'ctrl', '_02_tweak'), orgs[3], use_connect=False, inherit_scale=None)
+            self.set_bone_parent(n.toe2_tweak, orgs[3], use_connect=False, inherit_scale=None)
             #HANDLE FOOT END
-            self.set_bone_parent(make_derived_name(orgs[2], 'mch', '_handle_end'), make_derived_name(orgs[3], 'ctrl', '_01_tweak'), use_connect=False, inherit_scale=None)
+            self.set_bone_parent(n.foot_handle_end, n.toe1_tweak, use_connect=False, inherit_scale=None)
             #HANDLE TOE START
-            self.set_bone_parent(make_derived_name(orgs[3], 'mch', '_handle_start'), make_derived_name(orgs[3], 'ctrl', '_01_tweak'), use_connect=False, inherit_scale=None)
+            self.set_bone_parent(n.toe_handle_start, n.toe1_tweak, use_connect=False, inherit_scale=None)
             #HANDLE TOE END
-            self.set_bone_parent(make_derived_name(orgs[3], 'mch', '_handle_end'), make_derived_name(orgs[3], 'ctrl', '_02_tweak'), use_connect=False, inherit_scale=None)
+            self.set_bone_parent(n.toe_handle_end, n.toe2_tweak, use_connect=False, inherit_scale=None)
 
 
     @stage.configure_bones
     def configure_foot_bend_bones(self):
-        if self.params.make_bendable_foot:
+        if self.use_bendable_foot:
             orgs = self.bones.org.main
+            n = self._n
+            pb = self.obj.pose.bones
+            db = self.obj.data.bones
 
             #Foot DEF
-            foot = self.bones.deform[-2]
-            self.obj.data.bones[foot].bbone_handle_type_start = 'TANGENT'
-            self.obj.data.bones[foot].bbone_handle_type_end = 'TANGENT'
-            self.obj.data.bones[foot].bbone_custom_handle_start = self.obj.data.bones[orgs[2]]
-            self.obj.data.bones[foot].bbone_custom_handle_end = self.obj.data.bones[make_derived_name(orgs[2], 'mch', '_handle_end')]
-            self.obj.data.bones[foot].bbone_handle_use_scale_end[0] = True
-            self.obj.data.bones[foot].bbone_handle_use_scale_end[2] = True
-            self.obj.data.bones[foot].inherit_scale = 'ALIGNED'
+            dbf = db[self.bones.deform[-2]]
+            dbf.bbone_handle_type_start = 'TANGENT'
+            dbf.bbone_handle_type_end = 'TANGENT'
+            dbf.bbone_custom_handle_start = db[orgs[2]]
+            dbf.bbone_custom_handle_end = db[n.foot_handle_end]
+            dbf.bbone_handle_use_scale_end[0] = True
+            dbf.bbone_handle_use_scale_end[2] = True
+            dbf.inherit_scale = 'ALIGNED'
 
             #Toe DEF
-            toe = self.bones.deform[-1]
-            self.obj.data.bones[toe].bbone_handle_type_start = 'TANGENT'
-            self.obj.data.bones[toe].bbone_handle_type_end = 'TANGENT'
-            self.obj.data.bones[toe].bbone_custom_handle_start = self.obj.data.bones[make_derived_name(orgs[3], 'mch', '_handle_start')]
-            self.obj.data.bones[toe].bbone_custom_handle_end = self.obj.data.bones[make_derived_name(orgs[3], 'mch', '_handle_end')]
-            self.obj.data.bones[toe].bbone_handle_use_scale_start[0] = True
-            self.obj.data.bones[toe].bbone_handle_use_scale_start[2] = True
-            self.obj.data.bones[toe].bbone_handle_use_scale_end[0] = True
-            self.obj.data.bones[toe].bbone_handle_use_scale_end[2] = True
+            dbt = db[self.bones.deform[-1]]
+            dbt.bbone_handle_type_start = 'TANGENT'
+            dbt.bbone_handle_type_end = 'TANGENT'
+            dbt.bbone_custom_handle_start = db[n.toe_handle_start]
+            dbt.bbone_custom_handle_end = db[n.toe_handle_end]
+            dbt.bbone_handle_use_scale_start[0] = True
+            dbt.bbone_handle_use_scale_start[2] = True
+            dbt.bbone_handle_use_scale_end[0] = True
+            dbt.bbone_handle_use_scale_end[2] = True
 
             # put toe tweak bones on the correct layers
-            tweak_bones = [make_derived_name(orgs[3], 'ctrl', '_01_tweak'),make_derived_name(orgs[3], 'ctrl', '_02_tweak')]
-            if self.params.tweak_layers_extra:                
+            tweak_bones = [n.toe1_tweak, n.toe2_tweak]
+            if self.params.tweak_layers_extra:
+                # Resolve the target collection once for both tweaks
+                tweak_coll_refs = self.params.tweak_coll_refs
+                tweak_collection = None
+                if tweak_coll_refs:
+                    tweak_collection = self.obj.data.collections[tweak_coll_refs[0]['name']]
+
                 for bone in tweak_bones:
-                    if self.params.tweak_coll_refs:
-                        tweak_collection = self.params.tweak_coll_refs[0]['name']
-                        self.obj.data.collections[tweak_collection].assign(self.obj.pose.bones[bone])
-                    
+                    pbone = pb[bone]
+                    if tweak_collection is not None:
+                        tweak_collection.assign(pbone)
+
                     # Euler the toe tweak controls
-                    self.obj.pose.bones[bone].rotation_mode = 'ZXY'
+                    pbone.rotation_mode = 'ZXY'
 
                     # locks on the toe tweak controls
-                    self.obj.pose.bones[bone].lock_rotation = [True, False, True]
-                    self.obj.pose.bones[bone].lock_scale[1] = True
+                    pbone.lock_rotation = [True, False, True]
+                    pbone.lock_scale[1] = True
 
 
     @stage.rig_bones
     def rig_foot_bend_bones(self):
-        if self.params.make_bendable_foot:
-            orgs = self.bones.org.main
+        if self.use_bendable_foot:
+            # Every toe constraint targets one of the two toe tweaks
+            tweak01 = self._n.toe1_tweak
+            tweak02 = self._n.toe2_tweak
+            pb = self.obj.pose.bones
             #Foot DEF
             foot = self.bones.deform[-2]
-            con = self.obj.pose.bones[foot].constraints['Stretch To']
-            con.subtarget = make_derived_name(orgs[3], 'ctrl', '_01_tweak')
+            con = pb[foot].constraints['Stretch To']
+            con.subtarget = tweak01
 
             #Toe DEF
-            toe = self.bones.deform[-1]
+            toe_cons = pb[self.bones.deform[-1]].constraints
 
-            con = self.obj.pose.bones[toe].constraints.new(type='COPY_LOCATION')
+            con = toe_cons.new(type='COPY_LOCATION')
             con.target = self.obj
-            con.subtarget = make_derived_name(orgs[3], 'ctrl', '_01_tweak')
+            con.subtarget = tweak01
             
-            con = self.obj.pose.bones[toe].constraints.new(type='COPY_ROTATION')
+            con = toe_cons.new(type='COPY_ROTATION')
             con.target = self.obj
-            con.subtarget = make_derived_name(orgs[3], 'ctrl', '_01_tweak')
+            con.subtarget = tweak01
             con.mix_mode = 'BEFORE'
             con.owner_space = 'LOCAL'
             con.target_space = 'LOCAL'
 
-            con = self.obj.pose.bones[toe].constraints.new(type='COPY_SCALE')
+            con = toe_cons.new(type='COPY_SCALE')
             con.target = self.obj
-            con.subtarget = make_derived_name(orgs[3], 'ctrl', '_01_tweak')
+            con.subtarget = tweak01
 
-            con = self.obj.pose.bones[toe].constraints.new(type='STRETCH_TO')
+            con = toe_cons.new(type='STRETCH_TO')
             con.target = self.obj
-            con.subtarget = make_derived_name(orgs[3], 'ctrl', '_02_tweak')
+            con.subtarget = tweak02
             con.keep_axis = 'PLANE_X'
 
 
-            # con = self.obj.pose.bones[toe].constraints['Copy Transforms']
-            # con.subtarget = make_derived_name(orgs[3], 'ctrl', '_01_tweak')
+            # con = toe_cons['Copy Transforms']
+            # con.subtarget = tweak01
             # con.mute = True
 
 
     @stage.generate_widgets
     def make_foot_bend_widgets(self):
-        if self.params.make_bendable_foot:
-            orgs = self.bones.org.main
-            create_sphere_widget(self.obj, make_derived_name(orgs[3], 'ctrl', '_01_tweak'))
-            create_sphere_widget(self.obj, make_derived_name(orgs[3], 'ctrl', '_02_tweak'))
+        if self.use_bendable_foot:
+            create_sphere_widget(self.obj, self._n.toe1_tweak)
+            create_sphere_widget(self.obj, self._n.toe2_tweak)
 
 
     ####################################################
@@ -525,60 +603,58 @@ class Rig(BaseLimbRig):
 
     @stage.generate_bones
     def make_toe_break_bones(self):
-        if self.params.make_toe_break:
+        if self.use_toe_break:
             orgs = self.bones.org.main
+            n = self._n
 
             #MCH - Toe Reverse
             toe = orgs[3]
-            mch_toe_reverse = self.copy_bone(toe, make_derived_name(toe, 'mch', '_IK_reverse'))
+            mch_toe_reverse = self.copy_bone(toe, n.mch_toe_reverse)
             flip_bone(self.obj, mch_toe_reverse)
 
             #MCH = Foot Reverse
             foot = orgs[2]
-            mch_foot_reverse = self.copy_bone(foot, make_derived_name(foot, 'mch', '_IK_reverse'))
+            mch_foot_reverse = self.copy_bone(foot, n.mch_foot_reverse)
             flip_bone(self.obj, mch_foot_reverse)
 
             #Toe-reverse
-            toe_reverse = self.copy_bone(toe, make_derived_name(toe, 'ctrl', '_IK_reverse'), scale = 0.25)
-            tail = self.get_bone(orgs[3]).tail
-            tail_floored = [tail.x, tail.y, 0 ]
-            put_bone(self.obj, toe_reverse, tail_floored, matrix=self.ik_matrix, scale=0.5)
+            toe_reverse = self.copy_bone(toe, n.toe_reverse, scale = 0.25)
+            put_bone(self.obj, toe_reverse, self._toe_tail_floored, matrix=self.ik_matrix, scale=0.5)
 
             #Foot-reverse
-            foot_reverse = self.copy_bone(mch_foot_reverse, make_derived_name(foot, 'ctrl',  '_IK_reverse'), scale = 0.25)
+            foot_reverse = self.copy_bone(mch_foot_reverse, n.foot_reverse, scale = 0.25)
             align_bone_orientation(self.obj, foot_reverse, self.bones.ctrl.heel)
 
 
     @stage.parent_bones
     def parent_toe_break_bones(self):
-        if self.params.make_toe_break:
-            orgs = self.bones.org.main
-            heel = self.bones.org.heel
-            roll2 = make_derived_name(heel, 'mch', '_roll2')
+        if self.use_toe_break:
+            n = self._n
+            roll2 = n.roll2
 
             #MCH Toe Reverse
-            self.set_bone_parent(make_derived_name(orgs[3], 'mch', '_IK_reverse'),  make_derived_name(orgs[3], 'ctrl', '_IK_reverse'), use_connect=False, inherit_scale=None)
+            self.set_bone_parent(n.mch_toe_reverse, n.toe_reverse, use_connect=False, inherit_scale=None)
             #Toe Reverse
-            self.set_bone_parent(make_derived_name(orgs[3], 'ctrl', '_IK_reverse'), roll2, use_connect=False, inherit_scale=None)
+            self.set_bone_parent(n.toe_reverse, roll2, use_connect=False, inherit_scale=None)
            #MCH Foot Reverse
-            self.set_bone_parent(make_derived_name(orgs[2], 'mch', '_IK_reverse'), make_derived_name(orgs[2], 'ctrl', '_IK_reverse'), use_connect=False, inherit_scale=None)
+            self.set_bone_parent(n.mch_foot_reverse, n.foot_reverse, use_connect=False, inherit_scale=None)
            #Foot Reverse
-            self.set_bone_parent(make_derived_name(orgs[2], 'ctrl', '_IK_reverse'), roll2, use_connect=False, inherit_scale=None)
+            self.set_bone_parent(n.foot_reverse, roll2, use_connect=False, inherit_scale=None)
             
 
     @stage.configure_bones
     def configure_toe_break_bones(self):
-        if self.params.make_toe_break:
-            orgs = self.bones.org.main
-
-            reverse_bones = [make_derived_name(orgs[3], 'ctrl', '_IK_reverse'),make_derived_name(orgs[2], 'ctrl', '_IK_reverse')]
+        if self.use_toe_break:
+            reverse_bones = [self._n.toe_reverse, self._n.foot_reverse]
+            pb = self.obj.pose.bones
             for bone in reverse_bones:
+                pbone = pb[bone]
                 # Euler bones
-                self.obj.pose.bones[bone].rotation_mode = 'ZXY'
+                pbone.rotation_mode = 'ZXY'
 
-                # locks 
-                self.obj.pose.bones[bone].lock_location = [True, True, True]
-                self.obj.pose.bones[bone].lock_scale = [True, True, True]
+                # locks
+                pbone.lock_location = [True, True, True]
+                pbone.lock_scale = [True, True, True]
 
             # Add Toe Break Property
             panel = self.script.panel_with_selected_check(self, [self.bones.ctrl.heel, ])
@@ -589,130 +665,86 @@ class Rig(BaseLimbRig):
 
     @stage.rig_bones
     def rig_toe_break_bones(self):
-        if self.params.make_toe_break:
+        if self.use_toe_break:
             orgs = self.bones.org.main
-            
-            #MCH - Toe Reverse
-            toe_reverse = make_derived_name(orgs[3], 'ctrl', '_IK_reverse')
-            con = self.obj.pose.bones[toe_reverse].constraints.new(type='TRANSFORM')
-            con.target = self.obj
-            con.subtarget = self.bones.ctrl.heel
-            con.target_space = 'LOCAL'
-            con.owner_space = 'LOCAL'
-            con.map_from = 'ROTATION'
-            con.map_to = 'ROTATION'
-            con.mix_mode_rot = 'ADD'
+            n = self._n
+            pb = self.obj.pose.bones
 
-            self.make_driver(con, 'from_min_x_rot', type='SUM', expression='radians(var)', variables=[(self.bones.ctrl.heel, 'toe_break')], polynomial=None)
-            con.from_max_x_rot = radians(180)
-            con.to_max_x_rot = radians(180)
+            heel = self.bones.ctrl.heel
+            make_constraint = self.make_constraint
+            toe_break_var = [(heel, 'toe_break')]
+
+            #MCH - Toe Reverse
+            toe_reverse = n.toe_reverse
+            con = make_constraint(
+                toe_reverse, 'TRANSFORM', heel, mix_mode_rot='ADD',
+                from_max_x_rot=DEG_180, to_max_x_rot=DEG_180,
+                **_ROLL_TRANSFORM,
+            )
+            self.make_driver(con, 'from_min_x_rot', type='SUM', expression='radians(var)', variables=toe_break_var)
 
             #Foot Reverse
-            foot_reverse = make_derived_name(orgs[2], 'ctrl', '_IK_reverse')
-            mch_foot_reverse = make_derived_name(orgs[2], 'mch', '_IK_reverse')
-            toe_reverse = make_derived_name(orgs[3], 'ctrl', '_IK_reverse')
-            mch_toe_reverse = make_derived_name(orgs[3], 'mch', '_IK_reverse')
+            foot_reverse = n.foot_reverse
+            mch_foot_reverse = n.mch_foot_reverse
 
-            con = self.obj.pose.bones[foot_reverse].constraints.new(type='COPY_LOCATION')
-            con.target = self.obj
-            con.subtarget = mch_toe_reverse
-            con.head_tail = 1.0
+            make_constraint(foot_reverse, 'COPY_LOCATION', n.mch_toe_reverse, head_tail=1.0)
 
             # Foot Roll
-            con = self.obj.pose.bones[foot_reverse].constraints.new(type='TRANSFORM')
-            con.name = 'Foot Roll'
-            con.target = self.obj
-            con.subtarget = self.bones.ctrl.heel
-            con.target_space = 'LOCAL'
-            con.owner_space = 'LOCAL'
-            con.map_from = 'ROTATION'
-            con.map_to = 'ROTATION'
-            con.mix_mode_rot = 'ADD'
-
-            con.from_max_x_rot = radians(150)
-            con.to_max_x_rot = radians(180)
-
-            con.from_min_z_rot = radians(-180)
-            con.to_min_z_rot = radians(-180)
-
-            con.from_max_z_rot = radians(180)
-            con.to_max_z_rot = radians(180)
+            make_constraint(
+                foot_reverse, 'TRANSFORM', heel, name='Foot Roll', mix_mode_rot='ADD',
+                from_max_x_rot=DEG_150, to_max_x_rot=DEG_180,
+                from_min_z_rot=-DEG_180, to_min_z_rot=-DEG_180,
+                from_max_z_rot=DEG_180, to_max_z_rot=DEG_180,
+                **_ROLL_TRANSFORM,
+            )
 
             # Counter Roll
-            con = self.obj.pose.bones[foot_reverse].constraints.new(type='TRANSFORM')
-            con.name = 'Foot Roll Counter'
-            con.target = self.obj
-            con.subtarget = self.bones.ctrl.heel
-            con.target_space = 'LOCAL'
-            con.owner_space = 'LOCAL'
-            con.map_from = 'ROTATION'
-            con.map_to = 'ROTATION'
-            #con.mix_mode_rot = 'BEFORE'
-
-            self.make_driver(con, 'from_min_x_rot', type='SUM', expression='radians(var)', variables=[(self.bones.ctrl.heel, 'toe_break')], polynomial=None)
-            con.from_max_x_rot = radians(180)
-            
-            self.make_driver(con, 'to_max_x_rot', type='SUM', expression='-radians(var)', variables=[(self.bones.ctrl.heel, 'toe_break')], polynomial=None)
+            con = make_constraint(
+                foot_reverse, 'TRANSFORM', heel, name='Foot Roll Counter',
+                from_max_x_rot=DEG_180,
+                **_ROLL_TRANSFORM,
+            )
+            self.make_driver(con, 'from_min_x_rot', type='SUM', expression='radians(var)', variables=toe_break_var)
+            self.make_driver(con, 'to_max_x_rot', type='SUM', expression='-radians(var)', variables=toe_break_var)
 
             #Edit MCH-Heel_roll1
-            roll1 = self.get_bone(make_derived_name(self.bones.org.heel, 'mch', '_roll1'))
-            con = self.obj.pose.bones[roll1.name].constraints['Copy Rotation']
+            con = pb[n.roll1].constraints['Copy Rotation']
             con.use_x = False
 
-            con = self.obj.pose.bones[roll1.name].constraints.new(type='COPY_ROTATION')
-            con.target = self.obj
-            con.subtarget = foot_reverse
-            con.use_y = False
-            con.use_z = False
-            con.target_space = 'LOCAL'
-            con.owner_space = 'LOCAL'
+            make_constraint(n.roll1, 'COPY_ROTATION', foot_reverse, use_xyz=(True, False, False), space='LOCAL')
 
             #Edit MCH-Thigh_IK_target
-            thigh_IK_target = self.get_bone(make_derived_name(orgs[0], 'mch', '_IK_target'))
-            con = self.obj.pose.bones[thigh_IK_target.name].constraints['Copy Location']
+            con = pb[n.thigh_ik_target].constraints['Copy Location']
             con.target = self.obj
             con.subtarget =  mch_foot_reverse
             con.head_tail = 1.0
             #Add Damped track on the MCH-Thigh_IK_Target
-            con = self.obj.pose.bones[thigh_IK_target.name].constraints.new(type='DAMPED_TRACK')
-            con.target = self.obj
-            con.subtarget = foot_reverse
-            con.track_axis = 'TRACK_Y'
+            make_constraint(n.thigh_ik_target, 'DAMPED_TRACK', foot_reverse, track_axis='TRACK_Y')
             
             #Edit the MCH-Toe
-            if self.params.extra_ik_toe:
+            if self.use_ik_toe:
                 mch_toe = make_derived_name(orgs[3], 'mch', '_IK_parent')
             else:
                 mch_toe = make_derived_name(orgs[3], 'mch')
-            con = self.obj.pose.bones[mch_toe].constraints.new(type='COPY_ROTATION')
-            con.target = self.obj
-            con.subtarget = toe_reverse
-            con.target_space = 'WORLD'
-            con.owner_space = 'WORLD'
+            con = make_constraint(mch_toe, 'COPY_ROTATION', toe_reverse, space='WORLD')
 
-            self.make_driver(con, 'influence', variables=[(self.obj.pose.bones[self.bones.ctrl.master], 'IK_FK')], polynomial=[1.0,-1.0])
+            self.make_driver(con, 'influence', variables=[(pb[self.bones.ctrl.master], 'IK_FK')], polynomial=[1.0,-1.0])
 
 
     @stage.generate_widgets
     def make_toe_break_widgets(self):
-        if self.params.make_toe_break:
-            orgs = self.bones.org.main
-            foot_reverse = make_derived_name(orgs[2], 'ctrl', '_IK_reverse')
-            mch_foot_reverse = make_derived_name(orgs[2], 'mch', '_IK_reverse')
-            toe_reverse = make_derived_name(orgs[3], 'ctrl', '_IK_reverse')
-            mch_toe_reverse = make_derived_name(orgs[3], 'mch', '_IK_reverse')
-            
-            # Foot Reverse
-            foot_widget = create_triangle_widget(self.obj, foot_reverse)
-            rotfix = Matrix.Rotation(-math.pi/2, 4, 'X')
-            adjust_widget_transform_mesh(foot_widget, rotfix, local=True)
-            set_bone_widget_transform(self.obj, foot_reverse, mch_foot_reverse)  # NOT WORKING!
-            
-            
-            # Toe Reverse
-            toe_widget = create_triangle_widget(self.obj, toe_reverse, size=2.0)    
-            set_bone_widget_transform(self.obj, toe_reverse, mch_toe_reverse)
-            adjust_widget_transform_mesh(toe_widget, rotfix, local=True)  # NOT WORKING!
+        if self.use_toe_break:
+            n = self._n
+            rotfix = self._triangle_rotfix
+
+            # Foot Reverse and Toe Reverse
+            for ctrl, mch, size in (
+                (n.foot_reverse, n.mch_foot_reverse, 1.0),
+                (n.toe_reverse, n.mch_toe_reverse, 2.0),
+            ):
+                widget = create_triangle_widget(self.obj, ctrl, size=size)
+                set_bone_widget_transform(self.obj, ctrl, mch)
+                adjust_widget_transform_mesh(widget, rotfix, local=True)
 
     ####################################################
     # Settings
@@ -721,17 +753,8 @@ class Rig(BaseLimbRig):
     def add_parameters(self, params):
         super().add_parameters(params)
 
-        items = [
-            ('ANKLE', 'Ankle',
-             'The foots pivots at the ankle'),
-            ('TOE', 'Toe',
-             'The foot pivots around the base of the toe'),
-            ('ANKLE_TOE', 'Ankle and Toe',
-             'The foots pivots at the ankle, with extra toe pivot'),
-        ]
-
         params.foot_pivot_type = bpy.props.EnumProperty(
-            items   = items,
+            items   = _FOOT_PIVOT_ITEMS,
             name    = "Foot Pivot",
             default = 'ANKLE_TOE'
         )
@@ -773,6 +796,16 @@ class Rig(BaseLimbRig):
         super().parameters_ui(layout, params, 'Foot')
 
 
+# (name, head, tail, roll, use_connect, parent)
+_SAMPLE_BONES = (
+    ('Thigh.L', (0.0980, 0.0124, 1.0720), (0.0980, -0.0286, 0.5372), 0.0000, False, None),
+    ('Shin.L', (0.0980, -0.0286, 0.5372), (0.0980, 0.0162, 0.0852), 0.0000, True, 'Thigh.L'),
+    ('Foot.L', (0.0980, 0.0162, 0.0852), (0.0980, -0.0934, 0.0167), 0.0000, True, 'Shin.L'),
+    ('Toe.L', (0.0980, -0.0934, 0.0167), (0.0980, -0.1606, 0.0167), -0.0000, True, 'Foot.L'),
+    ('Heel.L', (0.0600, 0.0459, 0.0000), (0.1400, 0.0459, 0.0000), 0.0000, False, 'Foot.L'),
+)
+
+
 def create_sample(obj):  # noqa
     # generated by rigify.utils.write_metarig
     bpy.ops.object.mode_set(mode='EDIT')
@@ -780,49 +813,23 @@ def create_sample(obj):  # noqa
 
     bones = {}
 
-    bone = arm.edit_bones.new('Thigh.L')
-    bone.head = 0.0980, 0.0124, 1.0720
-    bone.tail = 0.0980, -0.0286, 0.5372
-    bone.roll = 0.0000
-    bone.use_connect = False
-    bones['Thigh.L'] = bone.name
-    bone = arm.edit_bones.new('Shin.L')
-    bone.head = 0.0980, -0.0286, 0.5372
-    bone.tail = 0.0980, 0.0162, 0.0852
-    bone.roll = 0.0000
-    bone.use_connect = True
-    bone.parent = arm.edit_bones[bones['Thigh.L']]
-    bones['Shin.L'] = bone.name
-    bone = arm.edit_bones.new('Foot.L')
-    bone.head = 0.0980, 0.0162, 0.0852
-    bone.tail = 0.0980, -0.0934, 0.0167
-    bone.roll = 0.0000
-    bone.use_connect = True
-    bone.parent = arm.edit_bones[bones['Shin.L']]
-    bones['Foot.L'] = bone.name
-    bone = arm.edit_bones.new('Toe.L')
-    bone.head = 0.0980, -0.0934, 0.0167
-    bone.tail = 0.0980, -0.1606, 0.0167
-    bone.roll = -0.0000
-    bone.use_connect = True
-    bone.parent = arm.edit_bones[bones['Foot.L']]
-    bones['Toe.L'] = bone.name
-    bone = arm.edit_bones.new('Heel.L')
-    bone.head = 0.0600, 0.0459, 0.0000
-    bone.tail = 0.1400, 0.0459, 0.0000
-    bone.roll = 0.0000
-    bone.use_connect = False
-    bone.parent = arm.edit_bones[bones['Foot.L']]
-    bones['Heel.L'] = bone.name
+    for name, head, tail, roll, use_connect, parent in _SAMPLE_BONES:
+        bone = arm.edit_bones.new(name)
+        bone.head = head
+        bone.tail = tail
+        bone.roll = roll
+        bone.use_connect = use_connect
+        if parent:
+            bone.parent = arm.edit_bones[bones[parent]]
+        bones[name] = bone.name
 
     bpy.ops.object.mode_set(mode='OBJECT')
+    # New pose bones are already unlocked, only the rotation mode differs
+    for name in bones.values():
+        obj.pose.bones[name].rotation_mode = 'XYZ'
+
     pbone = obj.pose.bones[bones['Thigh.L']]
     pbone.rigify_type = 'WayRig.limbs.leg_plus'
-    pbone.lock_location = (False, False, False)
-    pbone.lock_rotation = (False, False, False)
-    pbone.lock_rotation_w = False
-    pbone.lock_scale = (False, False, False)
-    pbone.rotation_mode = 'XYZ'
     try:
         pbone.rigify_parameters.make_bendable_foot = False
     except AttributeError:
@@ -835,40 +842,13 @@ def create_sample(obj):  # noqa
         pbone.rigify_parameters.ik_pole_name = 'Knee_Pole.L'
     except AttributeError:
         pass
-    pbone = obj.pose.bones[bones['Shin.L']]
-    pbone.rigify_type = ''
-    pbone.lock_location = (False, False, False)
-    pbone.lock_rotation = (False, False, False)
-    pbone.lock_rotation_w = False
-    pbone.lock_scale = (False, False, False)
-    pbone.rotation_mode = 'XYZ'
-    pbone = obj.pose.bones[bones['Foot.L']]
-    pbone.rigify_type = ''
-    pbone.lock_location = (False, False, False)
-    pbone.lock_rotation = (False, False, False)
-    pbone.lock_rotation_w = False
-    pbone.lock_scale = (False, False, False)
-    pbone.rotation_mode = 'XYZ'
-    pbone = obj.pose.bones[bones['Toe.L']]
-    pbone.rigify_type = ''
-    pbone.lock_location = (False, False, False)
-    pbone.lock_rotation = (False, False, False)
-    pbone.lock_rotation_w = False
-    pbone.lock_scale = (False, False, False)
-    pbone.rotation_mode = 'XYZ'
-    pbone = obj.pose.bones[bones['Heel.L']]
-    pbone.rigify_type = ''
-    pbone.lock_location = (False, False, False)
-    pbone.lock_rotation = (False, False, False)
-    pbone.lock_rotation_w = False
-    pbone.lock_scale = (False, False, False)
-    pbone.rotation_mode = 'XYZ'
 
     bpy.ops.object.mode_set(mode='EDIT')
-    for bone in arm.edit_bones:
-        bone.select = False
-        bone.select_head = False
-        bone.select_tail = False
+    edit_bones = arm.edit_bones
+    deselect = [False] * len(edit_bones)
+    edit_bones.foreach_set("select", deselect)
+    edit_bones.foreach_set("select_head", deselect)
+    edit_bones.foreach_set("select_tail", deselect)
     for b in bones:
         bone = arm.edit_bones[bones[b]]
         bone.select = True
@@ -2,14 +2,10 @@
 
 import bpy
 
-from itertools import count
-
 from rigify.utils.naming import make_derived_name
 from rigify.utils.bones import align_bone_orientation, align_bone_to_axis, set_bone_widget_transform, put_bone
 from rigify.utils.widgets_basic import create_circle_widget, create_sphere_widget
-from rigify.utils.widgets_special import create_neck_bend_widget, create_neck_tweak_widget
 from ....utils.switch_parent import SwitchParentBuilder
-from rigify.utils.misc import map_list
 
 
 from rigify.base_rig import stage
@@ -30,6 +26,13 @@ class Rig(BaseHeadTailRig):
 
         self.long_neck = len(self.bones.org) > 3
         self.has_neck = len(self.bones.org) > 1
+        self.bendable_head = self.params.make_bendable_head
+
+        # Head bone names shared by several stages
+        head = self.bones.org[-1]
+        self._head_ctrl_name = make_derived_name(head, 'ctrl')
+        self._head_top_tweak_name = make_derived_name(head, 'ctrl', '_top_tweak')
+        self._head_handle_end_name = make_derived_name(head, 'mch', '_handle_end')
 
     ####################################################
     # BONES
@@ -61,15 +64,17 @@ class Rig(BaseHeadTailRig):
     @stage.generate_bones
     def make_control_chain(self):
         orgs = self.bones.org
+        head_org = orgs[-1]
+        first_org = orgs[0]
         ctrl = self.bones.ctrl
 
         if self.has_neck:
-            ctrl.neck = self.make_neck_control_bone(orgs[0], 'Neck', orgs[-1])
+            ctrl.neck = self.make_neck_control_bone(first_org, 'Neck', head_org)
 
-        ctrl.head = self.make_head_control_bone(orgs[-1], make_derived_name(orgs[-1], 'ctrl'))
+        ctrl.head = self.make_head_control_bone(head_org, self._head_ctrl_name)
 
         if self.long_neck:
-            ctrl.neck_bend = self.make_neck_bend_control_bone(orgs[0],'Neck' + '_bend', ctrl.neck)
+            ctrl.neck_bend = self.make_neck_bend_control_bone(first_org, 'Neck' + '_bend', ctrl.neck)
 
         self.default_prop_bone = ctrl.head
 
@@ -87,11 +92,12 @@ class Rig(BaseHeadTailRig):
 
         # Neck pivot position
         neck_bones = self.bones.org
-        if (len(neck_bones)-1) % 2:     # odd num of neck bones (head excluded)
-            center_bone = self.get_bone(neck_bones[int((len(neck_bones))/2) - 1])
+        num_bones = len(neck_bones)
+        if (num_bones-1) % 2:     # odd num of neck bones (head excluded)
+            center_bone = self.get_bone(neck_bones[int(num_bones/2) - 1])
             neck_bend_eb.head = (center_bone.head + center_bone.tail)/2
         else:
-            center_bone = self.get_bone(neck_bones[int((len(neck_bones)-1)/2) - 1])
+            center_bone = self.get_bone(neck_bones[int((num_bones-1)/2) - 1])
             neck_bend_eb.head = center_bone.tail
 
         align_bone_orientation(self.obj, name, neck)
@@ -111,30 +117,35 @@ class Rig(BaseHeadTailRig):
 
     @stage.parent_bones
     def parent_control_chain(self):
-        orgs = self.bones.org
+        head_org = self.bones.org[-1]
         ctrl = self.bones.ctrl
         mch = self.bones.mch
+        set_bone_parent = self.set_bone_parent
         if self.has_neck:
-            self.set_bone_parent(ctrl.neck, mch.rot_neck)
-        self.set_bone_parent(ctrl.head, mch.rot_head)
+            set_bone_parent(ctrl.neck, mch.rot_neck)
+        set_bone_parent(ctrl.head, mch.rot_head)
         if self.long_neck:
-            self.set_bone_parent(ctrl.neck_bend, mch.stretch)
+            set_bone_parent(ctrl.neck_bend, mch.stretch)
         if self.params.world_align_head:
-            self.set_bone_parent(orgs[-1], ctrl.head)
-            self.obj.data.edit_bones[orgs[-1]].use_connect = False
+            set_bone_parent(head_org, ctrl.head)
+            self.obj.data.edit_bones[head_org].use_connect = False
 
     @stage.configure_bones
     def configure_control_chain(self):
+        orgs = self.bones.org
+        head_org = orgs[-1]
+        first_org = orgs[0]
+        ctrl = self.bones.ctrl
         if self.has_neck:
-            self.configure_control_bone(0, self.bones.ctrl.neck, self.bones.org[0])
-        self.configure_control_bone(2, self.bones.ctrl.head, self.bones.org[-1])
+            self.configure_control_bone(0, ctrl.neck, first_org)
+        self.configure_control_bone(2, ctrl.head, head_org)
         if self.long_neck:
-            self.configure_neck_bend_bone(self.bones.ctrl.neck_bend, self.bones.org[0])
-        if self.params.make_bendable_head:
-            bone_list = [self.bones.ctrl.neck] + self.bones.ctrl.tweak + [self.bones.ctrl.head]
+            self.configure_neck_bend_bone(ctrl.neck_bend, first_org)
+        if self.bendable_head:
+            bone_list = [ctrl.neck] + ctrl.tweak + [ctrl.head]
             panel = self.script.panel_with_selected_check(self, bone_list)
-            self.make_property(self.bones.ctrl.head, 'volume_preserve', 0.0, description='Preserve volume in stretch')
-            panel.custom_prop(self.bones.ctrl.head, 'volume_preserve', text='Preserve Volume (Head/Neck)', slider=True)
+            self.make_property(ctrl.head, 'volume_preserve', 0.0, description='Preserve volume in stretch')
+            panel.custom_prop(ctrl.head, 'volume_preserve', text='Preserve Volume (Head/Neck)', slider=True)
 
 
     def configure_neck_bend_bone(self, ctrl, org):
@@ -154,27 +165,26 @@ class Rig(BaseHeadTailRig):
     @stage.generate_widgets
     def make_control_widgets(self):
         ctrl = self.bones.ctrl
+        radius = 1/max(1, len(self.bones.mch.chain))
         if self.has_neck:
-            self.make_neck_widget(ctrl.neck)
+            self.make_neck_widget(ctrl.neck, radius)
         self.make_head_widget(ctrl.head)
         if self.long_neck:
-            self.make_neck_bend_widget(ctrl.neck_bend)
-
-    def make_neck_widget(self, ctrl):
-        radius = 1/max(1, len(self.bones.mch.chain))
+            self.make_neck_bend_widget(ctrl.neck_bend, radius/2)
 
+    def make_neck_widget(self, ctrl, radius):
         create_circle_widget(
             self.obj, ctrl,
             radius=radius,
             head_tail=0.5,
         )
 
-    def make_neck_bend_widget(self, ctrl):
-        radius = 1/max(1, len(self.bones.mch.chain))
+    def make_neck_bend_widget(self, ctrl, radius):
+        from rigify.utils.widgets_special import create_neck_bend_widget
 
         create_neck_bend_widget(
             self.obj, ctrl,
-            radius=radius/2,
+            radius=radius,
             head_tail=0.0,
         )
 
@@ -202,12 +212,15 @@ class Rig(BaseHeadTailRig):
     @stage.generate_bones
     def make_mch_control_bones(self):
         orgs = self.bones.org
+        head_org = orgs[-1]
+        first_org = orgs[0]
         mch = self.bones.mch
 
         if self.has_neck:
-            mch.rot_neck = self.make_mch_follow_bone(orgs[0], make_derived_name(orgs[0], 'ctrl'), 0.5, copy_scale=True)
-            mch.stretch = self.make_mch_stretch_bone(orgs[0], 'STR-' + make_derived_name(orgs[0], 'ctrl'), orgs[-1])
-        mch.rot_head = self.make_mch_follow_bone(orgs[-1], make_derived_name(orgs[-1], 'ctrl'), 0.0, copy_scale=True)
+            neck_name = make_derived_name(first_org, 'ctrl')
+            mch.rot_neck = self.make_mch_follow_bone(first_org, neck_name, 0.5, copy_scale=True)
+            mch.stretch = self.make_mch_stretch_bone(first_org, 'STR-' + neck_name, head_org)
+        mch.rot_head = self.make_mch_follow_bone(head_org, self._head_ctrl_name, 0.0, copy_scale=True)
 
     def make_mch_stretch_bone(self, org, name, org_head):
         name = self.copy_bone(org, make_derived_name(name, 'mch'), parent=False)
@@ -216,12 +229,14 @@ class Rig(BaseHeadTailRig):
 
     @stage.parent_bones
     def parent_mch_control_bones(self):
+        mch = self.bones.mch
         if self.has_neck:
-            self.set_bone_parent(self.bones.mch.rot_neck, self.rig_parent_bone)
-            self.set_bone_parent(self.bones.mch.rot_head, self.bones.ctrl.neck)
-            self.set_bone_parent(self.bones.mch.stretch, self.bones.ctrl.neck)
+            neck = self.bones.ctrl.neck
+            self.set_bone_parent(mch.rot_neck, self.rig_parent_bone)
+            self.set_bone_parent(mch.rot_head, neck)
+            self.set_bone_parent(mch.stretch, neck)
         else:
-            self.set_bone_parent(self.bones.mch.rot_head, self.rig_parent_bone)
+            self.set_bone_parent(mch.rot_head, self.rig_parent_bone)
 
     @stage.rig_bones
     def rig_mch_control_bones(self):
@@ -238,10 +253,11 @@ class Rig(BaseHeadTailRig):
     def make_mch_ik_chain(self):
         orgs = self.bones.org
         if self.long_neck:
-            self.bones.mch.ik = map_list(self.make_mch_ik_bone, orgs[0:-1])
-
-    def make_mch_ik_bone(self, org):
-        return self.copy_bone(org, make_derived_name(org, 'mch', '_IK'), parent=False)
+            copy_bone = self.copy_bone
+            self.bones.mch.ik = [
+                copy_bone(org, make_derived_name(org, 'mch', '_IK'), parent=False)
+                for org in orgs[0:-1]
+            ]
 
     @stage.parent_bones
     def parent_mch_ik_chain(self):
@@ -254,15 +270,12 @@ class Rig(BaseHeadTailRig):
     def rig_mch_ik_chain(self):
         if self.long_neck:
             ik = self.bones.mch.ik
-            head = self.bones.ctrl.head
-            for args in zip(count(0), ik):
-                self.rig_mch_ik_bone(*args, len(ik), head)
+            pose_bones = self.obj.pose.bones
+            for mch in ik:
+                pose_bones[mch].ik_stretch = 0.1
 
-    def rig_mch_ik_bone(self, i, mch, ik_len, head):
-        if i == ik_len - 1:
-            self.make_constraint(mch, 'IK', head, chain_count=ik_len)
-
-        self.get_bone(mch).ik_stretch = 0.1
+            # Only the tip of the chain carries the IK constraint
+            self.make_constraint(ik[-1], 'IK', self.bones.ctrl.head, chain_count=len(ik))
 
     ####################################################
     # MCH chain for the middle of the neck
@@ -270,10 +283,11 @@ class Rig(BaseHeadTailRig):
     @stage.generate_bones
     def make_mch_chain(self):
         orgs = self.bones.org
-        self.bones.mch.chain = map_list(self.make_mch_bone, orgs[1:-1])
-
-    def make_mch_bone(self, org):
-        return self.copy_bone(org, make_derived_name(org, 'mch'), parent=False, scale=1/4)
+        copy_bone = self.copy_bone
+        self.bones.mch.chain = [
+            copy_bone(org, make_derived_name(org, 'mch'), parent=False, scale=1/4)
+            for org in orgs[1:-1]
+        ]
 
     @stage.parent_bones
     def align_mch_chain(self):
@@ -288,41 +302,41 @@ class Rig(BaseHeadTailRig):
 
     @stage.rig_bones
     def rig_mch_chain(self):
-        chain = self.bones.mch.chain
+        mch = self.bones.mch
+        ctrl = self.bones.ctrl
+        chain = mch.chain
+        len_mch = len(chain)
         if self.long_neck:
-            ik = self.bones.mch.ik
-            for args in zip(count(0), chain, ik[1:]):
-                self.rig_mch_bone_long(*args, len(chain))
+            step = 2/(len_mch+1)
+            rig_mch_bone_long = self.rig_mch_bone_long
+            for i, (bone, ik) in enumerate(zip(chain, mch.ik[1:])):
+                rig_mch_bone_long(i, bone, ik, step, ctrl.neck_bend, ctrl.neck)
         else:
-            for args in zip(count(0), chain):
-                self.rig_mch_bone(*args, len(chain))
-
-    def rig_mch_bone_long(self, i, mch, ik, len_mch):
-        ctrl = self.bones.ctrl
+            step = 1/(len_mch+1)
+            rig_mch_bone = self.rig_mch_bone
+            for i, bone in enumerate(chain):
+                rig_mch_bone(i, bone, step, ctrl.head, ctrl.neck)
 
+    def rig_mch_bone_long(self, i, mch, ik, step, neck_bend, neck):
         self.make_constraint(mch, 'COPY_LOCATION', ik)
 
-        step = 2/(len_mch+1)
         xval = (i+1)*step
-        influence = 2*xval - xval**2    #parabolic influence of pivot
+        influence = xval*(2 - xval)    #parabolic influence of pivot
 
         self.make_constraint(
-            mch, 'COPY_LOCATION', ctrl.neck_bend,
+            mch, 'COPY_LOCATION', neck_bend,
             influence=influence, use_offset=True, space='LOCAL'
         )
 
-        self.make_constraint(mch, 'COPY_SCALE', ctrl.neck)
+        self.make_constraint(mch, 'COPY_SCALE', neck)
 
-    def rig_mch_bone(self, i, mch, len_mch):
-        ctrl = self.bones.ctrl
-
-        nfactor = float((i + 1) / (len_mch + 1))
+    def rig_mch_bone(self, i, mch, step, head, neck):
         self.make_constraint(
-            mch, 'COPY_ROTATION', ctrl.head,
-            influence=nfactor, space='LOCAL'
+            mch, 'COPY_ROTATION', head,
+            influence=(i+1)*step, space='LOCAL'
         )
 
-        self.make_constraint(mch, 'COPY_SCALE', ctrl.neck)
+        self.make_constraint(mch, 'COPY_SCALE', neck)
 
     ####################################################
     # Tweak bones
@@ -330,7 +344,8 @@ class Rig(BaseHeadTailRig):
     @stage.generate_bones
     def make_tweak_chain(self):
         orgs = self.bones.org
-        self.bones.ctrl.tweak = map_list(self.make_tweak_bone, count(0), orgs[0:-1])
+        make_tweak_bone = self.make_tweak_bone
+        self.bones.ctrl.tweak = [make_tweak_bone(i, org) for i, org in enumerate(orgs[0:-1])]
         if not self.has_neck:
             self.check_connect_tweak(orgs[0])
 
@@ -349,6 +364,8 @@ class Rig(BaseHeadTailRig):
     def generate_neck_tweak_widget(self):
         # Generate the widget early to override connected parent
         if self.long_neck:
+            from rigify.utils.widgets_special import create_neck_tweak_widget
+
             bone = self.bones.ctrl.tweak[0]
             create_neck_tweak_widget(self.obj, bone, size=1.0)
 
@@ -366,104 +383,114 @@ class Rig(BaseHeadTailRig):
 
     @stage.configure_bones
     def configure_bbone_chain(self):
-        if not self.params.make_bendable_head:
-            self.get_bone(self.bones.deform[-1]).bone.bbone_segments = 1
+        if not self.bendable_head:
+            self.obj.data.bones[self.bones.deform[-1]].bbone_segments = 1
 
     @stage.rig_bones
     def rig_org_chain(self):
+        orgs = self.bones.org
+        ctrl = self.bones.ctrl
 
         if self.has_neck:
-            tweaks = self.bones.ctrl.tweak + [self.bones.ctrl.head]
+            tweaks = ctrl.tweak + [ctrl.head]
         else:
-            tweaks = [self.connected_tweak or self.bones.ctrl.head]
+            tweaks = [self.connected_tweak or ctrl.head]
 
-        for args in zip(count(0), self.bones.org, tweaks, tweaks[1:] + [None]):
-            self.rig_org_bone(*args)
+        rig_org_bone = self.rig_org_bone
+        for i, (org, tweak, next_tweak) in enumerate(zip(orgs, tweaks, tweaks[1:] + [None])):
+            rig_org_bone(i, org, tweak, next_tweak)
 
-        if self.params.make_bendable_head:
+        if self.bendable_head:
             #adding driver for volume preservation
-            for bone in self.bones.org[0:-1]:
-                self.make_driver(self.obj.pose.bones[bone].constraints[-1], 'bulge', variables=[(self.bones.ctrl.head, 'volume_preserve')])
+            make_driver = self.make_driver
+            pose_bones = self.obj.pose.bones
+            variables = [(ctrl.head, 'volume_preserve')]
+            for bone in orgs[0:-1]:
+                make_driver(pose_bones[bone].constraints[-1], 'bulge', variables=variables)
 
     ####################################################
     # BENDABLE HEAD
 
     @stage.generate_bones
     def make_head_bend_bones(self):
-        if self.params.make_bendable_head:
-            orgs = self.bones.org
+        if self.bendable_head:
+            head = self.bones.org[-1]
+            head_tail = self.obj.pose.bones[head].tail
 
             #Head_top_tweak
-            head = orgs[-1]
-            head_top_tweak = self.copy_bone(head, make_derived_name(orgs[-1], 'ctrl', '_top_tweak'), scale = 0.25)
-            put_bone(self.obj, head_top_tweak, pos=self.obj.pose.bones[orgs[-1]].tail, matrix=None)
+            head_top_tweak = self.copy_bone(head, self._head_top_tweak_name, scale = 0.25)
+            put_bone(self.obj, head_top_tweak, pos=head_tail, matrix=None)
             align_bone_to_axis(self.obj, head_top_tweak, 'y', length=None, roll=0, flip=False)
 
             #Head handle_end
-            head_handle_end = self.copy_bone(head, make_derived_name(orgs[-1], 'mch', '_handle_end'), scale = 0.15)
-            put_bone(self.obj, head_handle_end, pos=self.obj.pose.bones[orgs[-1]].tail, matrix=None)
+            head_handle_end = self.copy_bone(head, self._head_handle_end_name, scale = 0.15)
+            put_bone(self.obj, head_handle_end, pos=head_tail, matrix=None)
 
 
     @stage.parent_bones
     def parent_head_bend_bones(self):
-        if self.params.make_bendable_head:
-            orgs = self.bones.org
+        if self.bendable_head:
             #Head_top_tweak
-            self.set_bone_parent(make_derived_name(orgs[-1], 'ctrl', '_top_tweak'),  make_derived_name(orgs[-1], 'ctrl'), use_connect=False, inherit_scale=None)
+            self.set_bone_parent(self._head_top_tweak_name,  self._head_ctrl_name, use_connect=False, inherit_scale=None)
             #Head handle_end
-            self.set_bone_parent(make_derived_name(orgs[-1], 'mch', '_handle_end'), make_derived_name(orgs[-1], 'ctrl', '_top_tweak'), use_connect=False, inherit_scale=None)
+            self.set_bone_parent(self._head_handle_end_name, self._head_top_tweak_name, use_connect=False, inherit_scale=None)
 
 
     @stage.configure_bones
     def configure_head_bend_bones(self):
-        if self.params.make_bendable_head:
-            orgs = self.bones.org
+        if self.bendable_head:
+            head_org = self.bones.org[-1]
 
             #head DEF
-            head = self.bones.deform[-1]
-            self.obj.data.bones[head].bbone_handle_type_start = 'TANGENT'
-            self.obj.data.bones[head].bbone_handle_type_end = 'TANGENT'
-            self.obj.data.bones[head].bbone_custom_handle_start = self.obj.data.bones[orgs[-1]]
-            self.obj.data.bones[head].bbone_custom_handle_end = self.obj.data.bones[make_derived_name(orgs[-1], 'mch', '_handle_end')]
-            self.obj.data.bones[head].bbone_handle_use_scale_end[0] = True
-            self.obj.data.bones[head].bbone_handle_use_scale_end[2] = True
-            self.obj.data.bones[head].inherit_scale = 'ALIGNED'
+            data_bones = self.obj.data.bones
+            db = data_bones[self.bones.deform[-1]]
+            db.bbone_handle_type_start = 'TANGENT'
+            db.bbone_handle_type_end = 'TANGENT'
+            db.bbone_custom_handle_start = data_bones[head_org]
+            db.bbone_custom_handle_end = data_bones[self._head_handle_end_name]
+            db.bbone_handle_use_scale_end[0] = True
+            db.bbone_handle_use_scale_end[2] = True
+            db.inherit_scale = 'ALIGNED'
 
 
             # put head tweak bones on the correct layers
-            tweak_bones = [make_derived_name(orgs[-1], 'ctrl', '_top_tweak')]
+            tweak_bones = [self._head_top_tweak_name]
+            tweak_coll_refs = self.params.tweak_coll_refs
+            tweak_collection = None
+            if tweak_coll_refs:
+                tweak_collection = self.obj.data.collections[tweak_coll_refs[0]['name']]
+
+            pose_bones = self.obj.pose.bones
             for bone in tweak_bones:
-                if self.params.tweak_coll_refs:
-                        tweak_collection = self.params.tweak_coll_refs[0]['name']
-                        self.obj.data.collections[tweak_collection].assign(self.obj.pose.bones[bone])
+                pbone = pose_bones[bone]
+                if tweak_collection is not None:
+                    tweak_collection.assign(pbone)
 
                 # Euler the tweak controls
-                self.obj.pose.bones[bone].rotation_mode = 'ZXY'
+                pbone.rotation_mode = 'ZXY'
 
                 # locks on the tweak controls
-                # self.obj.pose.bones[bone].lock_rotation = [True, False, True]
-                # self.obj.pose.bones[bone].lock_scale[1] = True
+                # pbone.lock_rotation = [True, False, True]
+                # pbone.lock_scale[1] = True
 
 
     @stage.rig_bones
     def rig_head_bend_bones(self):
-        if self.params.make_bendable_head:
-            orgs = self.bones.org
+        if self.bendable_head:
             #Head DEF
             head = self.bones.deform[-1]
-            head_tweak = make_derived_name(orgs[-1], 'ctrl', '_top_tweak')
+            head_tweak = self._head_top_tweak_name
 
             self.make_constraint(head, 'STRETCH_TO', head_tweak, keep_axis='SWING_Y')
 
             # add copy scale to head_handle_end
-            self.make_constraint(make_derived_name(orgs[-1], 'mch', '_handle_end'), 'COPY_SCALE', self.bones.ctrl.head)
+            self.make_constraint(self._head_handle_end_name, 'COPY_SCALE', self.bones.ctrl.head)
 
 
     @stage.generate_widgets
     def make_head_bend_widgets(self):
-        if self.params.make_bendable_head:
-            orgs = self.bones.org
-            create_sphere_widget(self.obj, make_derived_name(orgs[-1], 'ctrl', '_top_tweak'))
+        if self.bendable_head:
+            create_sphere_widget(self.obj, self._head_top_tweak_name)
 
     ####################################################
     # SETTINGS
@@ -493,6 +520,14 @@ class Rig(BaseHeadTailRig):
 
 
 
+# (name, head, tail, roll, use_connect, parent)
+_SAMPLE_BONES = (
+    ('Neck_01', (0.0000, 0.0114, 1.6582), (0.0000, -0.0130, 1.7197), 0.0000, False, None),
+    ('Neck_02', (0.0000, -0.0130, 1.7197), (0.0000, -0.0247, 1.7813), 0.0000, True, 'Neck_01'),
+    ('Head', (0.0000, -0.0247, 1.7813), (0.0000, -0.0247, 1.9796), 0.0000, True, 'Neck_02'),
+)
+
+
 def create_sample(obj, *, parent=None):
     # generated by rigify.utils.write_metarig
     bpy.ops.object.mode_set(mode='EDIT')
@@ -500,37 +535,25 @@ def create_sample(obj, *, parent=None):
 
     bones = {}
 
-    bone = arm.edit_bones.new('Neck_01')
-    bone.head[:] = 0.0000, 0.0114, 1.6582
-    bone.tail[:] = 0.0000, -0.0130, 1.7197
-    bone.roll = 0.0000
-    bone.use_connect = False
-    if parent:
-        bone.parent = arm.edit_bones[parent]
-    bones['Neck_01'] = bone.name
-    bone = arm.edit_bones.new('Neck_02')
-    bone.head[:] = 0.0000, -0.0130, 1.7197
-    bone.tail[:] = 0.0000, -0.0247, 1.7813
-    bone.roll = 0.0000
-    bone.use_connect = True
-    bone.parent = arm.edit_bones[bones['Neck_01']]
-    bones['Neck_02'] = bone.name
-    bone = arm.edit_bones.new('Head')
-    bone.head[:] = 0.0000, -0.0247, 1.7813
-    bone.tail[:] = 0.0000, -0.0247, 1.9796
-    bone.roll = 0.0000
-    bone.use_connect = True
-    bone.parent = arm.edit_bones[bones['Neck_02']]
-    bones['Head'] = bone.name
+    for name, head, tail, roll, use_connect, bone_parent in _SAMPLE_BONES:
+        bone = arm.edit_bones.new(name)
+        bone.head[:] = head
+        bone.tail[:] = tail
+        bone.roll = roll
+        bone.use_connect = use_connect
+        if bone_parent:
+            bone.parent = arm.edit_bones[bones[bone_parent]]
+        elif parent:
+            bone.parent = arm.edit_bones[parent]
+        bones[name] = bone.name
 
     bpy.ops.object.mode_set(mode='OBJECT')
+    # New pose bones are already unlocked, only the rotation mode differs
+    for name in bones.values():
+        obj.pose.bones[name].rotation_mode = 'XYZ'
+
     pbone = obj.pose.bones[bones['Neck_01']]
     pbone.rigify_type = 'WayRig.spines.super_head'
-    pbone.lock_location = (False, False, False)
-    pbone.lock_rotation = (False, False, False)
-    pbone.lock_rotation_w = False
-    pbone.lock_scale = (False, False, False)
-    pbone.rotation_mode = 'XYZ'
     try:
         pbone.rigify_parameters.connect_chain = bool(parent)
     except AttributeError:
@@ -539,26 +562,13 @@ def create_sample(obj, *, parent=None):
         pbone.rigify_parameters.tweak_layers = [False, False, False, False, True, False, False, False, False, False, False, False, False, False, False, False, False, False, False, False, False, False, False, False, False, False, False, False, False, False, False, False]
     except AttributeError:
         pass
-    pbone = obj.pose.bones[bones['Neck_02']]
-    pbone.rigify_type = ''
-    pbone.lock_location = (False, False, False)
-    pbone.lock_rotation = (False, False, False)
-    pbone.lock_rotation_w = False
-    pbone.lock_scale = (False, False, False)
-    pbone.rotation_mode = 'XYZ'
-    pbone = obj.pose.bones[bones['Head']]
-    pbone.rigify_type = ''
-    pbone.lock_location = (False, False, False)
-    pbone.lock_rotation = (False, False, False)
-    pbone.lock_rotation_w = False
-    pbone.lock_scale = (False, False, False)
-    pbone.rotation_mode = 'XYZ'
 
     bpy.ops.object.mode_set(mode='EDIT')
-    for bone in arm.edit_bones:
-        bone.select = False
-        bone.select_head = False
-        bone.select_tail = False
+    edit_bones = arm.edit_bones
+    deselect = [False] * len(edit_bones)
+    edit_bones.foreach_set("select", deselect)
+    edit_bones.foreach_set("select_head", deselect)
+    edit_bones.foreach_set("select_tail", deselect)
     for b in bones:
         bone = arm.edit_bones[bones[b]]
         bone.select = True
@@ -16,6 +16,9 @@ def create_triangle_widget(rig, bone_name, size=1.0, bone_transform_name=None):
         mesh = obj.data
         mesh.from_pydata(verts, edges, faces)
         mesh.update()
+        return obj
+    else:
+        return None
 
 def create_tongue_master_widget(rig, bone_name, size=1.0, bone_transform_name=None):
     obj = create_widget(rig, bone_name, bone_transform_name)
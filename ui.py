@@ -2,19 +2,31 @@
 
 import bpy
 
+from bpy.app.handlers import persistent
 from rigify.utils.errors import MetarigError
 from . import generate
 
 
+# Metarig status per object, reused across UI redraws until the next depsgraph update
+_metarig_cache = {}
+
+
+@persistent
+def _clear_metarig_cache(*_args):
+    _metarig_cache.clear()
+
+
 def is_metarig(obj):
     if not (obj and obj.data and obj.type == 'ARMATURE'):
         return False
     if 'rig_id' in obj.data:
         return False
-    for b in obj.pose.bones:
-        if b.rigify_type != "":
-            return True
-    return False
+
+    key = obj.as_pointer()
+    result = _metarig_cache.get(key)
+    if result is None:
+        result = _metarig_cache[key] = any(b.rigify_type for b in obj.pose.bones)
+    return result
 
 class Generate_WayRig(bpy.types.Operator):
     """Generates a rig from the active metarig armature"""
@@ -31,20 +43,20 @@ class Generate_WayRig(bpy.types.Operator):
         metarig = context.object
         try:
             generate.generate_rig(context, metarig)
-        except MetarigError as rig_exception:
-            import traceback
-            traceback.print_exc()
-
-            rigify_report_exception(self, rig_exception)
         except Exception as rig_exception:
             import traceback
             traceback.print_exc()
 
-            self.report({'ERROR'}, 'Generation has thrown an exception: ' + str(rig_exception))
+            if isinstance(rig_exception, MetarigError):
+                from rigify.ui import rigify_report_exception
+                rigify_report_exception(self, rig_exception)
+            else:
+                self.report({'ERROR'}, 'Generation has thrown an exception: ' + str(rig_exception))
         else:
             self.report({'INFO'}, 'Successfully generated: "' + metarig.data.rigify_target_rig.name + '"')
         finally:
-            bpy.ops.object.mode_set(mode='OBJECT')
+            if context.mode != 'OBJECT':
+                bpy.ops.object.mode_set(mode='OBJECT')
 
         return {'FINISHED'}
 
@@ -70,6 +82,11 @@ def register():
 
     bpy.types.VIEW3D_MT_rigify.append(add_wayrig_to_menu)
 
+    bpy.app.handlers.depsgraph_update_post.append(_clear_metarig_cache)
+    bpy.app.handlers.load_post.append(_clear_metarig_cache)
+    bpy.app.handlers.undo_post.append(_clear_metarig_cache)
+    bpy.app.handlers.redo_post.append(_clear_metarig_cache)
+
 
 def unregister():
     from bpy.utils import unregister_class
@@ -79,3 +96,9 @@ def unregister():
         unregister_class(cls)
 
     bpy.types.VIEW3D_MT_rigify.remove(add_wayrig_to_menu)
+
+    bpy.app.handlers.depsgraph_update_post.remove(_clear_metarig_cache)
+    bpy.app.handlers.load_post.remove(_clear_metarig_cache)
+    bpy.app.handlers.undo_post.remove(_clear_metarig_cache)
+    bpy.app.handlers.redo_post.remove(_clear_metarig_cache)
+    _metarig_cache.clear()
@@ -1,5 +1,21 @@
 import bpy
 
+def _rig_ancestors(rig):
+    """
+    Returns the ids of the rig and all of its parents.
+    The rig tree is fixed once generation starts, so the set is cached on the rig.
+    """
+    ancestors = getattr(rig, '_wayrig_ancestors', None)
+
+    if ancestors is None:
+        parent = rig.rigify_parent
+        ancestors = {id(rig)}
+        if parent:
+            ancestors.update(_rig_ancestors(parent))
+        ancestors = rig._wayrig_ancestors = frozenset(ancestors)
+
+    return ancestors
+
 def rig_is_child(rig, parent, *, strict=False):
     """
     Checks if the rig is a child of the parent.
@@ -11,10 +27,7 @@ def rig_is_child(rig, parent, *, strict=False):
     if rig and strict:
         rig = rig.rigify_parent
 
-    while rig:
-        if rig is parent:
-            return True
-
-        rig = rig.rigify_parent
+    if not rig:
+        return False
 
-    return False
+    return id(parent) in _rig_ancestors(rig)